@@ -0,0 +1,106 @@
+"""Add full-text search vectors on tasks and task_translations
+
+Вектор - обычный nullable-столбец, который поддерживает BEFORE-триггер.
+STORED generated column через ADD COLUMN переписал бы tasks и
+task_translations целиком под ACCESS EXCLUSIVE. Здесь блокировки короткие:
+ADD COLUMN и CREATE TRIGGER меняют только каталог, существующие строки
+заполняются пачками по id (каждая пачка - своя транзакция), индексы
+строятся CONCURRENTLY. Строки, записанные во время заполнения, вектор
+получают от триггера.
+
+Revision ID: 0150168a16d5
+Revises: d03244cc68e5
+Create Date: 2026-10-18 14:15:33.874012
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0150168a16d5'
+down_revision: Union[str, None] = 'd03244cc68e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TASK_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+CONFIG_CASE_SQL = (
+    "CASE language "
+    "WHEN 'ru' THEN 'russian'::regconfig "
+    "WHEN 'en' THEN 'english'::regconfig "
+    "WHEN 'de' THEN 'german'::regconfig "
+    "WHEN 'fr' THEN 'french'::regconfig "
+    "WHEN 'es' THEN 'spanish'::regconfig "
+    "WHEN 'it' THEN 'italian'::regconfig "
+    "ELSE 'simple'::regconfig END"
+)
+
+TRANSLATION_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector({CONFIG_CASE_SQL}, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector({CONFIG_CASE_SQL}, coalesce(description, '')), 'B')"
+)
+
+
+BACKFILL_BATCH_SIZE = 10000
+
+SEARCH_VECTORS = {
+    # таблица: (выражение, столбцы, от которых оно зависит)
+    'tasks': (TASK_SEARCH_VECTOR_SQL, 'title, description'),
+    'task_translations': (TRANSLATION_SEARCH_VECTOR_SQL, 'language, title, description'),
+}
+
+
+def _create_trigger(table: str, expression: str, columns: str) -> None:
+    op.execute(
+        f"CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$ BEGIN "
+        f"SELECT {expression} INTO NEW.search_vector FROM (SELECT NEW.*) AS t; "
+        "RETURN NEW; END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_search_vector_update "
+        f"BEFORE INSERT OR UPDATE OF {columns} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()"
+    )
+
+
+def _backfill(table: str, expression: str) -> None:
+    """Заполняет вектор пачками; вызывается в autocommit_block"""
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text(f"SELECT max(id) FROM {table}")).scalar() or 0
+    for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+        bind.execute(
+            sa.text(
+                f"UPDATE {table} SET search_vector = {expression} "
+                "WHERE id > :start AND id <= :end AND search_vector IS NULL"
+            ),
+            {"start": start, "end": start + BACKFILL_BATCH_SIZE}
+        )
+
+
+def upgrade() -> None:
+    for table, (expression, columns) in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        _create_trigger(table, expression, columns)
+    with op.get_context().autocommit_block():
+        for table, (expression, _) in SEARCH_VECTORS.items():
+            _backfill(table, expression)
+        op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_task_translations_search_vector', 'task_translations', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_task_translations_search_vector', table_name='task_translations', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_concurrently=True)
+    for table in SEARCH_VECTORS:
+        op.execute(f"DROP TRIGGER {table}_search_vector_update ON {table}")
+        op.execute(f"DROP FUNCTION {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,28 @@
+"""Add (user_id, start_time, id) index on tasks
+
+Revision ID: 08107a1b1399
+Revises: 94db3e3f0ef1
+Create Date: 2026-10-18 11:47:05.660931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08107a1b1399'
+down_revision: Union[str, None] = '94db3e3f0ef1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Без блокировки записи в tasks на время построения индекса
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_user_start_id', 'tasks', ['user_id', 'start_time', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_user_start_id', table_name='tasks', postgresql_concurrently=True)
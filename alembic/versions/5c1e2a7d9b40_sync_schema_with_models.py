@@ -0,0 +1,98 @@
+"""Sync users, tasks and task_translations with the models
+
+Revision ID: 5c1e2a7d9b40
+Revises: 014f6c53b0b8
+Create Date: 2026-10-18 18:40:12.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e2a7d9b40'
+down_revision: Union[str, None] = '014f6c53b0b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Начальная миграция создала tasks_en и таблицы без is_active/created_at/
+# updated_at, а модели работают с task_translations. Миграция проверяет
+# текущую схему, поэтому проходит и по БД, созданной через create_all
+# (такую БД помечают `alembic stamp 014f6c53b0b8`).
+
+
+def _add_timestamps(table: str, columns: set) -> None:
+    for name in ('created_at', 'updated_at'):
+        if name not in columns:
+            op.add_column(table, sa.Column(name, sa.DateTime(), server_default=sa.func.now(), nullable=False))
+            op.alter_column(table, name, server_default=None)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    user_columns = {column['name'] for column in inspector.get_columns('users')}
+    if 'is_active' not in user_columns:
+        op.add_column('users', sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False))
+        op.alter_column('users', 'is_active', server_default=None)
+    _add_timestamps('users', user_columns)
+
+    task_columns = {column['name']: column for column in inspector.get_columns('tasks')}
+    _add_timestamps('tasks', set(task_columns))
+    # create_all старых моделей создавал интервал без часового пояса,
+    # а tstzrange в GiST-индексе требует timestamptz
+    for name in ('start_time', 'end_time'):
+        if not getattr(task_columns[name]['type'], 'timezone', False):
+            op.alter_column(
+                'tasks', name,
+                type_=sa.DateTime(timezone=True),
+                postgresql_using=f"{name} AT TIME ZONE 'UTC'"
+            )
+
+    if 'task_translations' not in tables:
+        op.create_table('task_translations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('language', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_task_translations_language'), 'task_translations', ['language'], unique=False)
+        if 'tasks_en' in tables:
+            op.execute(
+                "INSERT INTO task_translations (task_id, language, title, description, created_at, updated_at) "
+                "SELECT task_id, 'en', title_en, description_en, now(), now() FROM tasks_en"
+            )
+
+    if 'tasks_en' in tables:
+        op.drop_table('tasks_en')
+
+
+def downgrade() -> None:
+    op.create_table('tasks_en',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('title_en', sa.String(), nullable=False),
+    sa.Column('description_en', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.execute(
+        "INSERT INTO tasks_en (task_id, title_en, description_en) "
+        "SELECT DISTINCT ON (task_id) task_id, title, description FROM task_translations "
+        "WHERE language = 'en' ORDER BY task_id, updated_at DESC"
+    )
+    op.drop_index(op.f('ix_task_translations_language'), table_name='task_translations')
+    op.drop_table('task_translations')
+    op.drop_column('tasks', 'updated_at')
+    op.drop_column('tasks', 'created_at')
+    op.drop_column('users', 'updated_at')
+    op.drop_column('users', 'created_at')
+    op.drop_column('users', 'is_active')
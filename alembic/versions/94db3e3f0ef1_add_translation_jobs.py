@@ -0,0 +1,42 @@
+"""Add translation jobs queue
+
+Revision ID: 94db3e3f0ef1
+Revises: f3e3b3f04534
+Create Date: 2026-10-18 11:04:17.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '94db3e3f0ef1'
+down_revision: Union[str, None] = 'f3e3b3f04534'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('translation_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_translation_jobs_pending_task', 'translation_jobs', ['task_id'], unique=True, postgresql_where=sa.text("status = 'pending'"))
+    op.create_index('ix_translation_jobs_status_run_after', 'translation_jobs', ['status', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_translation_jobs_status_run_after', table_name='translation_jobs')
+    op.drop_index('uq_translation_jobs_pending_task', table_name='translation_jobs', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_table('translation_jobs')
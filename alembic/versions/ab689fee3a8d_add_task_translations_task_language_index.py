@@ -0,0 +1,46 @@
+"""Add (task_id, language) index on task_translations
+
+Revision ID: ab689fee3a8d
+Revises: 08107a1b1399
+Create Date: 2026-10-18 12:21:38.104776
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab689fee3a8d'
+down_revision: Union[str, None] = '08107a1b1399'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX_NAME = 'ix_task_translations_task_language'
+
+
+def upgrade() -> None:
+    # Дубликаты (task_id, language) не дадут построить уникальный индекс:
+    # оставляем самый свежий перевод
+    op.execute(
+        "DELETE FROM task_translations AS older USING task_translations AS newer "
+        "WHERE older.task_id = newer.task_id AND older.language = newer.language "
+        "AND (older.updated_at, older.id) < (newer.updated_at, newer.id)"
+    )
+    with op.get_context().autocommit_block():
+        # Прерванный CREATE INDEX CONCURRENTLY оставляет индекс INVALID,
+        # который IF NOT EXISTS считал бы готовым
+        invalid = op.get_bind().execute(sa.text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+        ), {"name": INDEX_NAME}).scalar()
+        if invalid:
+            op.drop_index(INDEX_NAME, table_name='task_translations', postgresql_concurrently=True)
+        op.create_index(INDEX_NAME, 'task_translations', ['task_id', 'language'], unique=True, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name='task_translations', postgresql_concurrently=True)
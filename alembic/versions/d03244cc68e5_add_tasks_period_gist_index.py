@@ -0,0 +1,32 @@
+"""Add GiST index on tasks (user_id, tstzrange(start_time, end_time))
+
+Revision ID: d03244cc68e5
+Revises: 414216783786
+Create Date: 2026-10-18 13:40:12.385190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd03244cc68e5'
+down_revision: Union[str, None] = '414216783786'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gist позволяет держать user_id и диапазон в одном GiST-индексе
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_user_period ON tasks "
+            "USING gist (user_id, tstzrange(start_time, end_time, '[)'))"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_user_period")
@@ -0,0 +1,33 @@
+"""Add translation cache
+
+Revision ID: f3e3b3f04534
+Revises: 5c1e2a7d9b40
+Create Date: 2026-10-18 10:12:41.302118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3e3b3f04534'
+down_revision: Union[str, None] = '5c1e2a7d9b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('translation_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('source_lang', sa.String(), nullable=False),
+    sa.Column('target_lang', sa.String(), nullable=False),
+    sa.Column('translated_text', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('translation_cache')
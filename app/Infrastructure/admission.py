@@ -0,0 +1,86 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Optional, Tuple
+
+
+class ConcurrencyLimiter:
+    """Ограничение числа одновременно обрабатываемых запросов с очередью.
+
+    Очередь ограничена и по длине, и по времени ожидания: лишний запрос
+    сразу получает отказ, а не копит задержку для всех остальных.
+    """
+
+    def __init__(self, limit: int, queue_limit: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.queue_limit:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            return self._leave_queue(waiter)
+        except asyncio.CancelledError:
+            if self._leave_queue(waiter):
+                self.release()
+            raise
+        return True
+
+    def _leave_queue(self, waiter: asyncio.Future) -> bool:
+        """Убирает запрос из очереди; True, если слот ему уже достался"""
+        if waiter.done():
+            return True
+        waiter.cancel()
+        self._waiters.remove(waiter)
+        return False
+
+    def release(self) -> None:
+        # Слот переходит первому ожидающему, счетчик active не меняется
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class TokenBucketLimiter:
+    """Token bucket на каждого пользователя; хранит не больше max_keys корзин"""
+
+    def __init__(self, rate: float, burst: int, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, key: str) -> Optional[float]:
+        """None, если запрос пропущен, иначе через сколько секунд появится токен"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        retry_after = None
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
@@ -1,36 +1,230 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy import text
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.pool import NullPool
+from fastapi import Request
 from app.core.config import settings
+from app.Infrastructure.replica_router import ReplicaRouter
+from app.Infrastructure.metrics import InstrumentedQueuePool, instrument_engine
+from app.Infrastructure.query_tracker import track_queries
+from pathlib import Path
+from typing import List, Tuple
+from uuid import uuid4
+import functools
+import inspect
 import logging
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 # Создаем базовый класс для моделей
 class Base(DeclarativeBase):
     pass
 
+def pool_sizing(workers: int = settings.WEB_CONCURRENCY) -> Tuple[int, int]:
+    """Размер пула и overflow одного воркера.
+
+    Явные DB_POOL_SIZE/DB_MAX_OVERFLOW побеждают, иначе бюджет соединений
+    делится между воркерами: половина держится открытой, половина - overflow.
+    """
+    per_worker = max(2, settings.DB_CONNECTION_BUDGET // max(1, workers))
+    pool_size = settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else per_worker // 2
+    max_overflow = (
+        settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None
+        else per_worker - pool_size
+    )
+    return pool_size, max_overflow
+
+
+def _engine_options(name: str) -> dict:
+    connect_args = {
+        "timeout": settings.DB_CONNECT_TIMEOUT,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT,
+    }
+    if settings.DB_PGBOUNCER:
+        # В transaction pooling соседние транзакции попадают на разные
+        # серверные соединения, поэтому prepared statements не кэшируем,
+        # а их имена делаем уникальными
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+        # Имя пула - метка database в метриках
+        "pool_logging_name": name,
+    }
+    if settings.DB_NULL_POOL:
+        options["poolclass"] = NullPool
+    else:
+        pool_size, max_overflow = pool_sizing()
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
 # Создаем движок базы данных
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True  
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options("primary"))
+instrument_engine(engine, "primary")
+track_queries(engine, settings.SLOW_QUERY_THRESHOLD_MS / 1000)
+
+replica_engines = [
+    create_async_engine(url, **_engine_options(f"replica{number}"))
+    for number, url in enumerate(settings.DATABASE_REPLICA_URLS)
+]
+for number, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine, f"replica{number}")
+    track_queries(replica_engine, settings.SLOW_QUERY_THRESHOLD_MS / 1000)
+
+replica_router = ReplicaRouter(
+    replica_engines,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+    check_timeout=settings.DB_CONNECT_TIMEOUT
 )
 
+# Ключи session.info, по которым RoutingSession выбирает движок
+REPLICA_ALLOWED = "replica_allowed"
+READ_ONLY = "read_only"
+PINNED_TO_PRIMARY = "pinned_to_primary"
+
+
+class RoutingSession(Session):
+    """Отправляет чтения на реплику, все остальное - на primary.
+
+    На реплику уходят только запросы из методов, помеченных replica_read,
+    и только в сессиях, где реплики разрешены через allow_replica_reads.
+    После первой записи сессия до конца жизни читает с primary, чтобы
+    видеть свои же изменения.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[PINNED_TO_PRIMARY] = True
+        elif (
+            self.info.get(REPLICA_ALLOWED)
+            and self.info.get(READ_ONLY)
+            and not self.info.get(PINNED_TO_PRIMARY)
+        ):
+            replica = replica_router.choose()
+            if replica is not None:
+                return replica.sync_engine
+        return engine.sync_engine
+
 
 AsyncSessionLocal = async_sessionmaker(
-    engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
+
+def allow_replica_reads(session: AsyncSession) -> None:
+    session.info[REPLICA_ALLOWED] = True
+
+
+def replica_read(method):
+    """Помечает метод репозитория как чтение, допустимое с реплики"""
+    if inspect.isasyncgenfunction(method):
+        @functools.wraps(method)
+        async def stream_wrapper(self, *args, **kwargs):
+            outer = self.session.info.get(READ_ONLY, False)
+            self.session.info[READ_ONLY] = True
+            try:
+                async for item in method(self, *args, **kwargs):
+                    yield item
+            finally:
+                self.session.info[READ_ONLY] = outer
+        return stream_wrapper
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        # Вложенный вызов не должен снимать флаг внешнего
+        outer = self.session.info.get(READ_ONLY, False)
+        self.session.info[READ_ONLY] = True
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self.session.info[READ_ONLY] = outer
+    return wrapper
+
+
+async def check_pool_capacity(conn) -> None:
+    """Предупреждает, если пулы всех воркеров не помещаются в max_connections"""
+    if settings.DB_NULL_POOL:
+        logger.info("Connection pooling is delegated to an external pooler (NullPool)")
+        return
+
+    pool_size, max_overflow = pool_sizing()
+    required = (pool_size + max_overflow) * settings.WEB_CONCURRENCY
+    max_connections = int((await conn.execute(text("SHOW max_connections"))).scalar())
+    reserved = int((await conn.execute(text("SHOW superuser_reserved_connections"))).scalar())
+    available = max_connections - reserved
+    logger.info(
+        f"Database pool: pool_size={pool_size}, max_overflow={max_overflow}, "
+        f"workers={settings.WEB_CONCURRENCY}, server max_connections={max_connections}"
+    )
+    if required > available:
+        logger.warning(
+            f"Pools of {settings.WEB_CONCURRENCY} workers may open {required} connections, "
+            f"but the server accepts only {available}; "
+            f"lower DB_CONNECTION_BUDGET or put pgbouncer in front"
+        )
+
+
+def alembic_heads() -> List[str]:
+    # alembic нужен только для проверки схемы, поэтому импортируется здесь
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return ScriptDirectory.from_config(config).get_heads()
+
+
+async def check_schema_version(conn) -> None:
+    """Сверяет ревизию БД с head миграций и падает сразу при расхождении"""
+    expected = sorted(alembic_heads())
+    current = []
+    if (await conn.execute(text("SELECT to_regclass('alembic_version') IS NOT NULL"))).scalar():
+        current = sorted((await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars())
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema revision {current or 'none'} does not match "
+            f"migrations head {expected}; run `alembic upgrade head`"
+        )
+    logger.info(f"Database schema is at revision {', '.join(current)}")
+
+
 async def init_db():
+    """Проверка БД при старте; режим задает DB_SCHEMA_MODE.
+
+    check  - сверить ревизию alembic, без DDL (безопасно для многих воркеров)
+    create - create_all, как раньше; только для локальной разработки
+    skip   - ничего не проверять
+    """
     try:
         async with engine.begin() as conn:
-            logger.info("Creating database tables...")
-            await conn.run_sync(Base.metadata.create_all)
-            logger.info("Database tables created successfully")
+            await check_pool_capacity(conn)
+            if settings.DB_SCHEMA_MODE == "check":
+                await check_schema_version(conn)
+            elif settings.DB_SCHEMA_MODE == "create":
+                logger.info("Creating database tables...")
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+                await conn.run_sync(Base.metadata.create_all)
+                logger.info("Database tables created successfully")
+        await replica_router.start()
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
@@ -39,6 +233,7 @@ async def init_db():
 async def close_db():
     try:
         logger.info("Closing database connections...")
+        await replica_router.stop()
         await engine.dispose()
         logger.info("Database connections closed successfully")
     except Exception as e:
@@ -46,9 +241,18 @@ async def close_db():
         raise
 
 
-async def get_db():
+async def get_db(request: Request):
+    """Сессия и единица работы на запрос: один коммит в конце, откат при ошибке.
+
+    Чтения GET-запросов могут уйти на реплику; пишущие запросы целиком
+    работают с primary, чтобы проверки перед записью видели свежие данные.
+    """
     async with AsyncSessionLocal() as session:
+        if request.method in ("GET", "HEAD"):
+            allow_replica_reads(session)
         try:
             yield session
-        finally:
-            await session.close()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
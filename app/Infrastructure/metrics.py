@@ -0,0 +1,180 @@
+import os
+import time
+from typing import Tuple
+import prometheus_client
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+STATEMENT_TYPES = ("SELECT", "INSERT", "UPDATE", "DELETE", "COPY", "WITH")
+
+
+def multiprocess_mode() -> bool:
+    """С несколькими воркерами каждый процесс пишет свои значения в файлы
+    PROMETHEUS_MULTIPROC_DIR, а /metrics собирает их вместе"""
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ or "prometheus_multiproc_dir" in os.environ
+
+
+def _counter(name: str, documentation: str, labels: Tuple[str, ...]):
+    return prometheus_client.Counter(name, documentation, labels)
+
+
+def _histogram(name: str, documentation: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+    return prometheus_client.Histogram(name, documentation, labels, buckets=buckets)
+
+
+def _gauge(name: str, documentation: str, labels: Tuple[str, ...], multiprocess_mode: str = "livesum"):
+    # livesum: сумма по живым процессам, значения упавших не учитываются;
+    # livemostrecent - для значений, общих для всех процессов (состояние БД)
+    return prometheus_client.Gauge(name, documentation, labels, multiprocess_mode=multiprocess_mode)
+
+
+HTTP_REQUESTS = _counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+HTTP_LATENCY = _histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"), LATENCY_BUCKETS
+)
+HTTP_IN_PROGRESS = _gauge(
+    "http_requests_in_progress", "HTTP requests being processed", ("method",)
+)
+
+DB_QUERY_LATENCY = _histogram(
+    "db_query_duration_seconds", "Database statement latency", ("database", "statement"), DB_BUCKETS
+)
+DB_QUERY_ERRORS = _counter(
+    "db_query_errors_total", "Failed database statements", ("database", "statement")
+)
+DB_POOL_WAIT = _histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("database",), DB_BUCKETS
+)
+DB_POOL_IN_USE = _gauge(
+    "db_pool_connections_in_use", "Connections checked out of the pool", ("database",)
+)
+DB_POOL_OPEN = _gauge(
+    "db_pool_connections_open", "Connections opened by the pool", ("database",)
+)
+
+ADMISSION_QUEUE_WAIT = _histogram(
+    "admission_queue_wait_seconds", "Time admitted requests spent in the admission queue", ("group",), DB_BUCKETS
+)
+ADMISSION_REJECTED = _counter(
+    "admission_rejected_total", "Requests shed by admission control or rate limiting", ("group", "reason")
+)
+ADMISSION_IN_FLIGHT = _gauge(
+    "admission_in_flight", "Admitted requests being processed", ("group",)
+)
+
+PRINCIPAL_CACHE_LOOKUPS = _counter(
+    "principal_cache_lookups_total", "Authenticated principal cache lookups", ("result",)
+)
+
+TRANSLATION_LATENCY = _histogram(
+    "translation_request_duration_seconds", "Translation provider call latency", ("outcome",), LATENCY_BUCKETS
+)
+TRANSLATION_REQUESTS = _counter(
+    "translation_requests_total", "Translation provider calls", ("outcome",)
+)
+TRANSLATION_CHARACTERS = _counter(
+    "translation_characters_total", "Characters sent to the translation provider", ()
+)
+TRANSLATION_BATCHES = _counter(
+    "translation_batches_total", "Batches sent to the translation provider by the batcher", ()
+)
+TRANSLATION_BATCH_ITEMS = _counter(
+    "translation_batch_items_total", "Strings sent in translation batches", ()
+)
+# split - пачка отвергнута и разослана по строкам, failed - ошибка отдана всем
+TRANSLATION_BATCH_FAILURES = _counter(
+    "translation_batch_failures_total", "Failed translation batches by handling", ("action",)
+)
+
+# tier: memory - LRU процесса, db - таблица translation_cache
+TRANSLATION_CACHE_HITS = _counter(
+    "translation_cache_hits_total", "Translations served from the cache", ("tier",)
+)
+TRANSLATION_CACHE_MISSES = _counter(
+    "translation_cache_misses_total", "Translations not found in the cache tier", ("tier",)
+)
+TRANSLATION_CACHE_BYTES_SAVED = _counter(
+    "translation_cache_bytes_saved_total", "Source text bytes not sent to the provider thanks to the cache", ("tier",)
+)
+
+TRANSLATION_JOBS = _counter(
+    "translation_jobs_total", "Translation jobs handled by workers", ("outcome",)
+)
+TRANSLATION_QUEUE_JOBS = _gauge(
+    "translation_queue_jobs", "Translation jobs in the queue by status", ("status",), "livemostrecent"
+)
+TRANSLATION_QUEUE_LAG = _gauge(
+    "translation_queue_lag_seconds", "How long the oldest due pending translation job has waited", (), "livemostrecent"
+)
+
+
+def statement_type(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in STATEMENT_TYPES else "OTHER"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, замеряющий ожидание свободного соединения (включая открытие нового)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.logging_name or "primary").observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine, database: str) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_QUERY_LATENCY.labels(database, statement_type(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+        DB_QUERY_ERRORS.labels(database, statement_type(context.statement or "")).inc()
+
+    @event.listens_for(sync_engine.pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        DB_POOL_OPEN.labels(database).inc()
+
+    @event.listens_for(sync_engine.pool, "close")
+    def on_close(dbapi_connection, connection_record):
+        DB_POOL_OPEN.labels(database).dec()
+
+    @event.listens_for(sync_engine.pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_IN_USE.labels(database).inc()
+
+    @event.listens_for(sync_engine.pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_IN_USE.labels(database).dec()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if multiprocess_mode():
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Убирает livesum-gauge завершившегося воркера из общей статистики"""
+    if multiprocess_mode():
+        multiprocess.mark_process_dead(os.getpid())
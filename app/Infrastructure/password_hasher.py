@@ -0,0 +1,91 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+
+@functools.lru_cache(maxsize=None)
+def get_pwd_context():
+    """passlib и bcrypt-бэкенд загружаются при первом хешировании, а не при старте"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """Выполняет bcrypt в отдельном пуле, не блокируя event loop.
+
+    Число одновременно ожидающих операций ограничено: при переполнении
+    очереди сразу возвращается 503, а не копится задержка.
+    """
+
+    def __init__(self, executor_kind: str, max_workers: int, queue_limit: int):
+        if executor_kind not in ("process", "thread"):
+            raise ValueError("executor_kind must be 'process' or 'thread'")
+        self.executor_kind = executor_kind
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_workers + self.queue_limit:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password hashing is overloaded, retry later",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # spawn: форк процесса с работающим event loop и потоками небезопасен
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hasher",
+                )
+        return self._executor
+
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASHING_EXECUTOR,
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    queue_limit=settings.PASSWORD_HASHING_QUEUE_LIMIT
+)
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.Infrastructure.metrics import PRINCIPAL_CACHE_LOOKUPS
+from app.domain.value_objects.principal import Principal
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY с id пользователя уходит в том же коммите, что и его изменение
+PRINCIPAL_CHANNEL = "principal_invalidated"
+
+
+class PrincipalCache:
+    """Ограниченный TTL+LRU кэш аутентифицированных пользователей по токену.
+
+    Кэш живёт в пределах одного процесса. Инвалидацию из других воркеров
+    доставляет PrincipalInvalidationListener; если он не работает, чужой
+    воркер увидит изменение не позже чем через ttl_seconds.
+
+    Запрос, загрузивший пользователя до invalidate_user, не должен вернуть
+    в кэш устаревший снимок: перед загрузкой он берёт generation(), а set()
+    отбрасывает запись, если пользователя с тех пор инвалидировали.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        # Номер последней инвалидации по пользователю. Старые номера
+        # вытесняются, а их максимум уходит в _generation_floor: запись,
+        # начатая не позже него, отбрасывается для любого пользователя
+        self._generation = 0
+        self._invalidated_at: "OrderedDict[int, int]" = OrderedDict()
+        self._generation_floor = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self._miss()
+            return None
+
+        principal, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._discard(token)
+            self._miss()
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        PRINCIPAL_CACHE_LOOKUPS.labels("hit").inc()
+        return principal
+
+    def generation(self) -> int:
+        """Текущий номер инвалидации; берётся до загрузки пользователя из БД"""
+        return self._generation
+
+    def set(
+        self,
+        token: str,
+        principal: Principal,
+        generation: int,
+        token_expires_at: Optional[datetime] = None
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        if generation < max(self._generation_floor, self._invalidated_at.get(principal.id, 0)):
+            # Пользователя инвалидировали, пока шла загрузка
+            return
+
+        ttl = self.ttl_seconds
+        if token_expires_at is not None:
+            # Запись не должна пережить сам токен
+            ttl = min(ttl, token_expires_at.timestamp() - time.time())
+        if ttl <= 0:
+            return
+
+        self._discard(token)
+        self._entries[token] = (principal, time.monotonic() + ttl)
+        self._tokens_by_user.setdefault(principal.id, set()).add(token)
+
+        while len(self._entries) > self.max_size:
+            oldest_token = next(iter(self._entries))
+            self._discard(oldest_token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Удаляет все закэшированные токены пользователя"""
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+        self._generation += 1
+        self._invalidated_at.pop(user_id, None)
+        self._invalidated_at[user_id] = self._generation
+        while len(self._invalidated_at) > max(self.max_size, 1):
+            _, oldest_generation = self._invalidated_at.popitem(last=False)
+            self._generation_floor = max(self._generation_floor, oldest_generation)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+        # Загрузки, начатые до очистки, в кэш уже не попадут
+        self._generation += 1
+        self._invalidated_at.clear()
+        self._generation_floor = self._generation
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def _miss(self) -> None:
+        self.misses += 1
+        PRINCIPAL_CACHE_LOOKUPS.labels("miss").inc()
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[0].id
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+class PrincipalInvalidationListener:
+    """Слушает PRINCIPAL_CHANNEL на отдельном соединении и инвалидирует
+    пользователей в кэше своего процесса.
+
+    Пока соединения нет, уведомления теряются, поэтому после каждого
+    (пере)подключения кэш очищается целиком.
+    """
+
+    def __init__(self, cache: PrincipalCache, dsn: str, reconnect_delay: float = 1.0, check_interval: float = 30.0):
+        self.cache = cache
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.check_interval = check_interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run(), name="principal-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        import asyncpg
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(PRINCIPAL_CHANNEL, self._on_notify)
+                self.cache.clear()
+                while not self._stopping.is_set() and not lost.is_set():
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.check_interval)
+                    except asyncio.TimeoutError:
+                        # Обрыв сети без закрытия сокета иначе не заметить
+                        await connection.fetchval("SELECT 1", timeout=self.check_interval)
+                if lost.is_set():
+                    logger.warning("Principal invalidation listener lost its connection")
+            except Exception as e:
+                logger.warning(f"Principal invalidation listener disconnected: {e}")
+            finally:
+                if connection is not None:
+                    await asyncio.gather(connection.close(timeout=1), return_exceptions=True)
+            if not self._stopping.is_set():
+                self.cache.clear()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.reconnect_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.cache.invalidate_user(int(payload))
+        except ValueError:
+            logger.warning(f"Unexpected {PRINCIPAL_CHANNEL} payload: {payload!r}")
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def create_invalidation_listener() -> Optional[PrincipalInvalidationListener]:
+    if not settings.PRINCIPAL_CACHE_NOTIFY or settings.PRINCIPAL_CACHE_SIZE <= 0:
+        return None
+    url = settings.PRINCIPAL_CACHE_LISTEN_URL
+    if url is None:
+        if settings.DB_PGBOUNCER:
+            logger.warning(
+                "PRINCIPAL_CACHE_LISTEN_URL is not set behind pgbouncer: other workers "
+                f"see user changes within PRINCIPAL_CACHE_TTL_SECONDS={settings.PRINCIPAL_CACHE_TTL_SECONDS}"
+            )
+            return None
+        url = settings.DATABASE_URL
+    dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+    return PrincipalInvalidationListener(principal_cache, dsn)
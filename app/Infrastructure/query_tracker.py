@@ -0,0 +1,91 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_STATEMENT = 1000
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryStats:
+    """Счетчик запросов к БД в рамках одного HTTP-запроса"""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def repeated(self, threshold: int) -> list:
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_tracking(budget: int):
+    return _current.set(QueryStats(budget))
+
+
+def stop_tracking(token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def compact_statement(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_LOGGED_STATEMENT:
+        statement = statement[:MAX_LOGGED_STATEMENT] + "..."
+    return statement
+
+
+def redact_parameters(parameters, executemany: bool) -> str:
+    # Значения параметров могут содержать личные данные, в лог идут только типы
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "<redacted>"
+
+
+def track_queries(engine: AsyncEngine, slow_query_seconds: float) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("tracker_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["tracker_started"].pop()
+
+        stats = _current.get()
+        if stats is not None:
+            stats.count += 1
+            stats.total_time += elapsed
+            # Запрос с bind-параметрами и есть "форма": значения в текст не попадают
+            stats.shapes[statement] += 1
+
+        if elapsed >= slow_query_seconds:
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms): {compact_statement(statement)} "
+                f"params={redact_parameters(parameters, executemany)}"
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None and context.connection.info.get("tracker_started"):
+            context.connection.info["tracker_started"].pop()
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import random
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# На простаивающем primary pg_last_xact_replay_timestamp стареет, хотя
+# реплика ничего не пропустила, поэтому при догнанном WAL отставание - 0.
+# На сервере не в режиме recovery (обычный второй инстанс) - тоже 0.
+REPLICATION_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def _on_error(self, context) -> None:
+        # Обрыв соединения выводит реплику из ротации до следующей проверки
+        if context.is_disconnect and self.healthy:
+            self.healthy = False
+            logger.warning(f"Replica {self.name} disconnected, reads fall back to primary")
+
+
+class ReplicaRouter:
+    """Выбор реплики для чтений с проверкой здоровья и отставания.
+
+    Пока проверки не запущены или ни одна реплика не прошла проверку,
+    choose() возвращает None и чтения идут на primary.
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        max_lag_seconds: float,
+        check_interval: float,
+        check_timeout: float
+    ):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._monitor: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[AsyncEngine]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        return random.choice(healthy).engine if healthy else None
+
+    async def start(self) -> None:
+        if not self.replicas or self._monitor is not None:
+            return
+        await self.check_all()
+        self._monitor = asyncio.create_task(self._run(), name="replica-health-monitor")
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        for replica in self.replicas:
+            replica.healthy = False
+            await replica.engine.dispose()
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    def stats(self) -> List[dict]:
+        return [
+            {"replica": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds}
+            for replica in self.replicas
+        ]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with replica.engine.connect() as conn:
+                    lag = (await conn.execute(REPLICATION_LAG_QUERY)).scalar()
+        except Exception as e:
+            lag = None
+            error = str(e) or e.__class__.__name__
+        else:
+            error = None if lag is not None else "replay timestamp is unknown"
+
+        replica.lag_seconds = float(lag) if lag is not None else None
+        healthy = error is None and replica.lag_seconds <= self.max_lag_seconds
+        if healthy != replica.healthy:
+            if healthy:
+                logger.info(f"Replica {replica.name} is back in rotation (lag {replica.lag_seconds:.1f}s)")
+            elif error is not None:
+                logger.warning(f"Replica {replica.name} failed health check: {error}")
+            else:
+                logger.warning(
+                    f"Replica {replica.name} lags {replica.lag_seconds:.1f}s "
+                    f"(max {self.max_lag_seconds}s), reads fall back to primary"
+                )
+        replica.healthy = healthy
@@ -0,0 +1,80 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
+from typing import List, Optional, Tuple
+from datetime import datetime
+from app.domain.models.task_import import TaskImport
+
+STAGING_TABLE = "tasks_import_staging"
+STAGING_COLUMNS = ["user_id", "title", "description", "start_time", "end_time"]
+
+class TaskImportRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_import(self, user_id: int) -> TaskImport:
+        task_import = TaskImport(user_id=user_id, errors=[])
+        self.session.add(task_import)
+        await self.session.commit()
+        await self.session.refresh(task_import)
+        return task_import
+
+    async def get_import(self, import_id: int, user_id: int) -> Optional[TaskImport]:
+        result = await self.session.execute(
+            select(TaskImport).where(TaskImport.id == import_id, TaskImport.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def copy_and_merge(self, records: List[Tuple]) -> List[int]:
+        """COPY пачки во временную таблицу и слияние в tasks, без коммита.
+
+        Строки, нарушающие unique_task_interval, пропускаются.
+        Возвращает id вставленных задач.
+        """
+        await self.session.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ("
+            "user_id integer NOT NULL, title varchar NOT NULL, description varchar, "
+            "start_time timestamptz NOT NULL, end_time timestamptz NOT NULL"
+            ") ON COMMIT DROP"
+        ))
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+        )
+
+        result = await self.session.execute(text(
+            "INSERT INTO tasks (user_id, title, description, start_time, end_time, created_at, updated_at) "
+            "SELECT user_id, title, description, start_time, end_time, "
+            "timezone('utc', now()), timezone('utc', now()) "
+            f"FROM {STAGING_TABLE} "
+            "ON CONFLICT DO NOTHING "
+            "RETURNING id"
+        ))
+        inserted_ids = list(result.scalars().all())
+        await self.session.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+        return inserted_ids
+
+    async def save_checkpoint(
+        self,
+        task_import: TaskImport,
+        rows_processed: int,
+        imported: int,
+        skipped: int,
+        errors: List[dict],
+        max_errors: int
+    ) -> None:
+        """Фиксирует чекпоинт вместе с данными пачки в одной транзакции"""
+        task_import.rows_processed = rows_processed
+        task_import.rows_imported += imported
+        task_import.rows_skipped += skipped
+        task_import.rows_failed += len(errors)
+        if errors and len(task_import.errors) < max_errors:
+            task_import.errors = task_import.errors + errors[:max_errors - len(task_import.errors)]
+        task_import.updated_at = datetime.utcnow()
+        await self.session.commit()
+
+    async def finish(self, task_import: TaskImport, status: str) -> None:
+        task_import.status = status
+        task_import.updated_at = datetime.utcnow()
+        await self.session.commit()
@@ -1,20 +1,31 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete
-from typing import List, Optional, Dict
+from sqlalchemy import delete, update, tuple_, exists, func, and_, literal_column
+from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy.dialects.postgresql import JSON, insert
+from typing import AsyncIterator, List, Optional, Dict
+from datetime import datetime
 from app.domain.models.task import Task
-from app.domain.models.translation import TaskTranslation
+from app.domain.models.translation import TaskTranslation, search_config
+from app.domain.value_objects.task_cursor import TaskCursor, TaskSearchCursor
+from app.Infrastructure.database import replica_read
+
+SEARCH_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
 
 class TaskRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def create_task(self, task: Task) -> Task:
+    async def create_task(self, task: Task, commit: bool = True) -> Task:
         self.session.add(task)
+        if not commit:
+            await self.session.flush()
+            return task
         await self.session.commit()
         await self.session.refresh(task)
         return task
 
+    @replica_read
     async def get_tasks_by_user(self, user_id: int, language: str = None) -> List[Task]:
         query = select(Task).where(Task.user_id == user_id)
         if language:
@@ -22,6 +33,296 @@ class TaskRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    def _task_view_query(self, language: Optional[str] = None):
+        """Задачи с полями на нужном языке и переводами одним запросом.
+
+        language=None - исходный язык, без JOIN. Иначе LEFT JOIN к переводу
+        на этом языке с откатом на исходные поля через COALESCE.
+        """
+        translations = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        func.json_build_object(
+                            "language", TaskTranslation.language,
+                            "title", TaskTranslation.title,
+                            "description", TaskTranslation.description
+                        )
+                    ),
+                    literal_column("'[]'::json"),
+                    type_=JSON
+                )
+            )
+            .where(TaskTranslation.task_id == Task.id)
+            .correlate(Task)
+            .scalar_subquery()
+        )
+
+        title = Task.title
+        description = Task.description
+        translation = None
+        if language is not None:
+            translation = aliased(TaskTranslation)
+            title = func.coalesce(translation.title, Task.title)
+            description = func.coalesce(translation.description, Task.description)
+
+        query = select(
+            Task.id,
+            Task.user_id,
+            title.label("title"),
+            description.label("description"),
+            Task.start_time,
+            Task.end_time,
+            Task.created_at,
+            Task.updated_at,
+            translations.label("translations")
+        )
+        if translation is not None:
+            query = query.outerjoin(
+                translation,
+                and_(translation.task_id == Task.id, translation.language == language)
+            )
+        return query
+
+    @replica_read
+    async def get_tasks_page(
+        self,
+        user_id: int,
+        limit: int,
+        language: Optional[str] = None,
+        after: Optional[TaskCursor] = None,
+        start_from: Optional[datetime] = None,
+        end_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        has_translation: Optional[bool] = None
+    ) -> List[Dict]:
+        """Страница задач в порядке (start_time, id), диапазонный скан по ix_tasks_user_start_id"""
+        query = self._task_view_query(language).where(Task.user_id == user_id)
+        if after is not None:
+            query = query.where(tuple_(Task.start_time, Task.id) > tuple_(after.start_time, after.id))
+        if start_from is not None:
+            query = query.where(Task.start_time >= start_from)
+        if end_to is not None:
+            query = query.where(Task.end_time <= end_to)
+        if updated_since is not None:
+            query = query.where(Task.updated_at >= updated_since)
+        if has_translation is not None:
+            translated = exists().where(TaskTranslation.task_id == Task.id)
+            query = query.where(translated if has_translation else ~translated)
+
+        result = await self.session.execute(
+            query
+            .order_by(Task.start_time, Task.id)
+            .limit(limit)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    @replica_read
+    async def get_task_view(self, task_id: int, user_id: int, language: Optional[str] = None) -> Optional[Dict]:
+        result = await self.session.execute(
+            self._task_view_query(language)
+            .where(Task.id == task_id, Task.user_id == user_id)
+        )
+        row = result.mappings().first()
+        return dict(row) if row else None
+
+    @replica_read
+    async def get_tasks_version(self, user_id: int) -> tuple:
+        """(число и max updated_at задач, число и max updated_at переводов)
+        одним запросом, без загрузки строк"""
+        tasks = (
+            select(func.count(Task.id).label("count"), func.max(Task.updated_at).label("updated_at"))
+            .where(Task.user_id == user_id)
+            .subquery()
+        )
+        translations = (
+            select(
+                func.count(TaskTranslation.id).label("count"),
+                func.max(TaskTranslation.updated_at).label("updated_at")
+            )
+            .join(Task, Task.id == TaskTranslation.task_id)
+            .where(Task.user_id == user_id)
+            .subquery()
+        )
+        # Оба агрегата - ровно по одной строке
+        result = await self.session.execute(
+            select(tasks.c.count, tasks.c.updated_at, translations.c.count, translations.c.updated_at)
+            .select_from(tasks)
+            .join(translations, literal_column("true"))
+        )
+        return tuple(result.one())
+
+    @replica_read
+    async def get_task_version(self, task_id: int, user_id: int) -> Optional[tuple]:
+        translations = (
+            select(
+                func.count(TaskTranslation.id).label("translations_count"),
+                func.max(TaskTranslation.updated_at).label("translations_updated_at")
+            )
+            .where(TaskTranslation.task_id == Task.id)
+            .correlate(Task)
+            .lateral()
+        )
+        result = await self.session.execute(
+            select(Task.updated_at, translations.c.translations_count, translations.c.translations_updated_at)
+            .select_from(Task)
+            .join(translations, literal_column("true"))
+            .where(Task.id == task_id, Task.user_id == user_id)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    @replica_read
+    async def stream_tasks(
+        self,
+        user_id: int,
+        chunk_size: int,
+        language: Optional[str] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Задачи пользователя пачками через серверный курсор.
+
+        Строки не превращаются в ORM-объекты и не накапливаются в памяти:
+        в каждый момент держится не больше chunk_size строк.
+        """
+        columns = [
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.start_time,
+            Task.end_time,
+            Task.created_at,
+            Task.updated_at,
+        ]
+        translation = None
+        if language is not None:
+            translation = aliased(TaskTranslation)
+            columns += [
+                translation.title.label("translated_title"),
+                translation.description.label("translated_description"),
+            ]
+        query = select(*columns).where(Task.user_id == user_id)
+        if translation is not None:
+            query = query.outerjoin(
+                translation,
+                and_(translation.task_id == Task.id, translation.language == language)
+            )
+
+        result = await self.session.stream(
+            query
+            .order_by(Task.start_time, Task.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in partition]
+
+    @replica_read
+    async def search_tasks(
+        self,
+        user_id: int,
+        query_text: str,
+        limit: int,
+        language: Optional[str] = None,
+        after: Optional[TaskSearchCursor] = None
+    ) -> List[Dict]:
+        """Полнотекстовый поиск по GIN-индексам с ранжированием и подсветкой.
+
+        language=None - поиск по исходному русскому тексту задачи, иначе по
+        переводу на этом языке со своей конфигурацией. ts_headline считается
+        только для строк текущей страницы.
+        """
+        config = literal_column(f"'{search_config(language or 'ru')}'::regconfig")
+        ts_query = func.websearch_to_tsquery(config, query_text)
+
+        translation = None
+        if language is None:
+            vector, match_title, match_description = Task.search_vector, Task.title, Task.description
+        else:
+            translation = aliased(TaskTranslation)
+            vector, match_title, match_description = (
+                translation.search_vector, translation.title, translation.description
+            )
+        rank = func.ts_rank_cd(vector, ts_query)
+
+        ranked = select(
+            Task.id.label("id"),
+            rank.label("rank"),
+            match_title.label("match_title"),
+            match_description.label("match_description")
+        ).select_from(Task)
+        if translation is not None:
+            ranked = ranked.join(
+                translation,
+                and_(translation.task_id == Task.id, translation.language == language)
+            )
+        ranked = ranked.where(Task.user_id == user_id, vector.op("@@")(ts_query))
+        if after is not None:
+            ranked = ranked.where(tuple_(-rank, Task.id) > tuple_(-after.rank, after.id))
+        ranked = ranked.order_by(rank.desc(), Task.id).limit(limit).subquery()
+
+        result = await self.session.execute(
+            self._task_view_query(language)
+            .add_columns(
+                ranked.c.rank,
+                func.ts_headline(config, ranked.c.match_title, ts_query, SEARCH_HEADLINE_OPTIONS)
+                .label("title_highlight"),
+                func.ts_headline(
+                    config, func.coalesce(ranked.c.match_description, ""), ts_query, SEARCH_HEADLINE_OPTIONS
+                ).label("description_highlight")
+            )
+            .join(ranked, ranked.c.id == Task.id)
+            .order_by(ranked.c.rank.desc(), Task.id)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    def _period(start_time, end_time):
+        # Полуоткрытый интервал: задачи "встык" не пересекаются
+        return func.tstzrange(start_time, end_time, literal_column("'[)'"))
+
+    @replica_read
+    async def get_overlapping_tasks(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int,
+        language: Optional[str] = None
+    ) -> List[Dict]:
+        """Задачи, пересекающиеся с интервалом; поиск по GiST-индексу ix_tasks_user_period"""
+        result = await self.session.execute(
+            self._task_view_query(language)
+            .where(
+                Task.user_id == user_id,
+                self._period(Task.start_time, Task.end_time).op("&&")(self._period(start_time, end_time))
+            )
+            .order_by(Task.start_time, Task.id)
+            .limit(limit)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def find_conflicts(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_task_id: Optional[int] = None
+    ) -> List[int]:
+        """Id задач, с которыми пересекается интервал.
+
+        Берет транзакционную advisory-блокировку расписания пользователя,
+        чтобы проверка и последующая запись не гонялись с параллельными.
+        """
+        await self.session.execute(select(func.pg_advisory_xact_lock(user_id)))
+        query = select(Task.id).where(
+            Task.user_id == user_id,
+            self._period(Task.start_time, Task.end_time).op("&&")(self._period(start_time, end_time))
+        )
+        if exclude_task_id is not None:
+            query = query.where(Task.id != exclude_task_id)
+        result = await self.session.execute(query.limit(10))
+        return list(result.scalars().all())
+
+    @replica_read
     async def get_task_by_id(self, task_id: int) -> Optional[Task]:
         result = await self.session.execute(
             select(Task)
@@ -30,12 +331,22 @@ class TaskRepository:
         )
         return result.scalars().first()
 
-    async def update_task(self, task_id: int, **kwargs) -> Optional[Task]:
-        task = await self.session.get(Task, task_id)
+    async def task_exists(self, task_id: int) -> bool:
+        result = await self.session.execute(select(exists().where(Task.id == task_id)))
+        return result.scalar()
+
+    async def update_task(self, task_id: int, commit: bool = True, **kwargs) -> Optional[Task]:
+        # Ответ сериализует translations, ленивая загрузка в async-сессии
+        # невозможна; задача из get_task_by_id к этому моменту уже может
+        # быть собрана GC, и get загрузит её заново
+        task = await self.session.get(Task, task_id, options=[selectinload(Task.translations)])
         if not task:
             return None
         for key, value in kwargs.items():
             setattr(task, key, value)
+        if not commit:
+            await self.session.flush()
+            return task
         await self.session.commit()
         await self.session.refresh(task)
         return task
@@ -74,14 +385,78 @@ class TaskRepository:
         await self.session.refresh(translation)
         return translation
 
-    async def delete_task(self, task_id: int) -> bool:
+    async def delete_task(self, task_id: int, commit: bool = True) -> bool:
         task = await self.session.get(Task, task_id)
         if task:
             await self.session.delete(task)
-            await self.session.commit()
+            if commit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
             return True
         return False
 
+    async def get_task_intervals(self, user_id: int, task_ids: List[int]) -> Dict[int, tuple]:
+        """Интервалы задач пользователя; чужие и несуществующие id не попадают"""
+        if not task_ids:
+            return {}
+        result = await self.session.execute(
+            select(Task.id, Task.start_time, Task.end_time)
+            .where(Task.user_id == user_id, Task.id.in_(task_ids))
+        )
+        return {task_id: (start_time, end_time) for task_id, start_time, end_time in result.all()}
+
+    async def get_tasks_by_intervals(self, user_id: int, intervals: List[tuple]) -> Dict[tuple, int]:
+        """id задач пользователя, уже занимающих интервалы (start_time, end_time)"""
+        if not intervals:
+            return {}
+        result = await self.session.execute(
+            select(Task.id, Task.start_time, Task.end_time)
+            .where(Task.user_id == user_id, tuple_(Task.start_time, Task.end_time).in_(intervals))
+        )
+        return {(start_time, end_time): task_id for task_id, start_time, end_time in result.all()}
+
+    async def bulk_create_tasks(self, rows: List[Dict]) -> List[Dict]:
+        """Многострочный INSERT ... RETURNING без коммита.
+
+        Строки, нарушившие unique_task_interval, пропускаются и не
+        попадают в результат.
+        """
+        if not rows:
+            return []
+        result = await self.session.execute(
+            insert(Task)
+            .values(rows)
+            .on_conflict_do_nothing()
+            .returning(Task.id, Task.start_time, Task.end_time)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def bulk_update_tasks(self, rows: List[Dict]) -> None:
+        """UPDATE по первичному ключу пачкой (executemany) без коммита.
+
+        Строки применяются по порядку, unique_task_interval проверяется
+        на каждой: пересечения интервалов проверяет вызывающий.
+        """
+        if not rows:
+            return
+        now = datetime.utcnow()
+        await self.session.execute(
+            update(Task),
+            [{**row, "updated_at": now} for row in rows]
+        )
+
+    async def bulk_delete_tasks(self, user_id: int, task_ids: List[int]) -> List[int]:
+        if not task_ids:
+            return []
+        result = await self.session.execute(
+            delete(Task)
+            .where(Task.user_id == user_id, Task.id.in_(task_ids))
+            .returning(Task.id)
+        )
+        return list(result.scalars().all())
+
+    @replica_read
     async def get_task_translations(
         self, 
         task_id: int, 
@@ -0,0 +1,29 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List
+from app.domain.models.translation_cache import TranslationCacheEntry
+
+class TranslationCacheRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_many(self, keys: List[str]) -> Dict[str, str]:
+        if not keys:
+            return {}
+        result = await self.session.execute(
+            select(TranslationCacheEntry.key, TranslationCacheEntry.translated_text)
+            .where(TranslationCacheEntry.key.in_(keys))
+        )
+        return {key: translated_text for key, translated_text in result.all()}
+
+    async def save_many(self, entries: List[dict]) -> None:
+        if not entries:
+            return
+        # Параллельные воркеры могут перевести одно и то же - побеждает первый
+        await self.session.execute(
+            insert(TranslationCacheEntry)
+            .values(entries)
+            .on_conflict_do_nothing(index_elements=[TranslationCacheEntry.key])
+        )
+        await self.session.commit()
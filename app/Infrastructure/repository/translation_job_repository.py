@@ -0,0 +1,143 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, or_, and_, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Optional
+from datetime import datetime, timedelta
+from app.domain.models.translation_job import TranslationJob
+
+class TranslationJobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, task_id: int, commit: bool = True) -> None:
+        # Если задание на задачу уже ждет в очереди, второе не нужно
+        now = datetime.utcnow()
+        await self.session.execute(
+            insert(TranslationJob)
+            .values(
+                task_id=task_id,
+                status=TranslationJob.STATUS_PENDING,
+                attempts=0,
+                run_after=now,
+                created_at=now,
+                updated_at=now
+            )
+            .on_conflict_do_nothing(
+                index_elements=[TranslationJob.task_id],
+                index_where=TranslationJob.status == TranslationJob.STATUS_PENDING
+            )
+        )
+        if commit:
+            await self.session.commit()
+
+    async def enqueue_many(self, task_ids: List[int], commit: bool = True) -> None:
+        """Ставит задания пачкой одним INSERT"""
+        if not task_ids:
+            return
+        now = datetime.utcnow()
+        await self.session.execute(
+            insert(TranslationJob)
+            .values([
+                {
+                    "task_id": task_id,
+                    "status": TranslationJob.STATUS_PENDING,
+                    "attempts": 0,
+                    "run_after": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for task_id in dict.fromkeys(task_ids)
+            ])
+            .on_conflict_do_nothing(
+                index_elements=[TranslationJob.task_id],
+                index_where=TranslationJob.status == TranslationJob.STATUS_PENDING
+            )
+        )
+        if commit:
+            await self.session.commit()
+
+    async def claim(self, limit: int, visibility_timeout: float) -> List[TranslationJob]:
+        """Забирает готовые задания, пропуская заблокированные другими воркерами.
+
+        Задания в статусе running с истекшим locked_at считаются брошенными
+        упавшим воркером и забираются повторно.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=visibility_timeout)
+        result = await self.session.execute(
+            select(TranslationJob)
+            .where(
+                or_(
+                    and_(
+                        TranslationJob.status == TranslationJob.STATUS_PENDING,
+                        TranslationJob.run_after <= now
+                    ),
+                    and_(
+                        TranslationJob.status == TranslationJob.STATUS_RUNNING,
+                        TranslationJob.locked_at < stale_before
+                    )
+                )
+            )
+            .order_by(TranslationJob.run_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = result.scalars().all()
+        for job in jobs:
+            job.status = TranslationJob.STATUS_RUNNING
+            job.locked_at = now
+            job.attempts += 1
+        await self.session.commit()
+        return jobs
+
+    async def complete(self, job_id: int) -> None:
+        await self.session.execute(
+            delete(TranslationJob).where(TranslationJob.id == job_id)
+        )
+        await self.session.commit()
+
+    async def fail(self, job_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        """Возвращает задание в очередь или, если retry_at не задан, в dead-letter"""
+        values = {
+            "locked_at": None,
+            "last_error": error,
+            "updated_at": datetime.utcnow(),
+        }
+        query = update(TranslationJob).where(TranslationJob.id == job_id)
+        if retry_at is None:
+            values["status"] = TranslationJob.STATUS_DEAD
+        else:
+            values["status"] = TranslationJob.STATUS_PENDING
+            values["run_after"] = retry_at
+            # Пока задание выполнялось, на задачу могли поставить новое
+            newer = aliased(TranslationJob)
+            query = query.where(
+                ~exists().where(
+                    newer.task_id == TranslationJob.task_id,
+                    newer.status == TranslationJob.STATUS_PENDING
+                )
+            )
+        result = await self.session.execute(query.values(**values))
+        if result.rowcount == 0 and retry_at is not None:
+            await self.session.execute(
+                delete(TranslationJob).where(TranslationJob.id == job_id)
+            )
+        await self.session.commit()
+
+    async def get_stats(self) -> dict:
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            select(
+                TranslationJob.status,
+                func.count(),
+                func.min(TranslationJob.run_after)
+            )
+            .group_by(TranslationJob.status)
+        )
+        stats = {"pending": 0, "running": 0, "dead": 0, "lag_seconds": 0.0}
+        for status, count, oldest_run_after in result.all():
+            stats[status] = count
+            if status == TranslationJob.STATUS_PENDING and oldest_run_after and oldest_run_after < now:
+                stats["lag_seconds"] = (now - oldest_run_after).total_seconds()
+        return stats
@@ -1,42 +1,52 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_
+from sqlalchemy import select, update, and_, or_, func
 from typing import Optional, List
 from app.domain.models.user import User
+from app.Infrastructure.principal_cache import PRINCIPAL_CHANNEL, principal_cache
+from app.Infrastructure.database import replica_read
 from datetime import datetime
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def create_user(self, username: str, email: str, password_hash: str) -> User:
+    async def create_user(self, username: str, email: str, password_hash: str, commit: bool = True) -> User:
         user = User(
             username=username, 
             email=email, 
             password_hash=password_hash
         )
         self.session.add(user)
+        if not commit:
+            await self.session.flush()
+            return user
         await self.session.commit()
         await self.session.refresh(user)
         return user
 
+    @replica_read
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         result = await self.session.execute(
             select(User).where(User.id == user_id)
         )
         return result.scalar_one_or_none()
 
+    @replica_read
     async def get_user_by_email(self, email: str) -> Optional[User]:
         result = await self.session.execute(
             select(User).where(User.email == email)
         )
         return result.scalar_one_or_none()
 
+    # Без replica_read: аутентификация должна сразу видеть деактивацию,
+    # а отстающая реплика вернула бы кэшу старую строку
     async def get_user_by_username(self, username: str) -> Optional[User]:
         result = await self.session.execute(
             select(User).where(User.username == username)
         )
         return result.scalar_one_or_none()
 
+    @replica_read
     async def get_active_users(self) -> List[User]:
         result = await self.session.execute(
             select(User).where(User.is_active == True)
@@ -51,7 +61,9 @@ class UserRepository:
         for key, value in kwargs.items():
             setattr(user, key, value)
         
+        await self._notify_invalidation(user_id)
         await self.session.commit()
+        principal_cache.invalidate_user(user_id)
         await self.session.refresh(user)
         return user
 
@@ -61,14 +73,18 @@ class UserRepository:
             .where(User.id == user_id)
             .values(is_active=False, updated_at=datetime.utcnow())
         )
+        await self._notify_invalidation(user_id)
         await self.session.commit()
+        principal_cache.invalidate_user(user_id)
         return result.rowcount > 0
 
     async def delete_user(self, user_id: int) -> bool:
         user = await self.get_user_by_id(user_id)
         if user:
             await self.session.delete(user)
+            await self._notify_invalidation(user_id)
             await self.session.commit()
+            principal_cache.invalidate_user(user_id)
             return True
         return False
 
@@ -87,6 +103,12 @@ class UserRepository:
         )
         return result.first() is not None
 
+    async def username_or_email_taken(self, username: str, email: str) -> bool:
+        result = await self.session.execute(
+            select(User.id).where(or_(User.username == username, User.email == email)).limit(1)
+        )
+        return result.first() is not None
+
     async def update_password(self, user_id: int, new_password_hash: str) -> bool:
         result = await self.session.execute(
             update(User)
@@ -96,5 +118,12 @@ class UserRepository:
                 updated_at=datetime.utcnow()
             )
         )
+        await self._notify_invalidation(user_id)
         await self.session.commit()
-        return result.rowcount > 0
\ No newline at end of file
+        principal_cache.invalidate_user(user_id)
+        return result.rowcount > 0
+
+    async def _notify_invalidation(self, user_id: int) -> None:
+        # Уведомление доставляется только при коммите: другие воркеры
+        # сбросят кэш, когда изменение уже видно в БД
+        await self.session.execute(select(func.pg_notify(PRINCIPAL_CHANNEL, str(user_id))))
@@ -0,0 +1,55 @@
+import re
+from typing import List, Tuple
+
+# Конец предложения: знаки препинания (и закрывающие кавычки/скобки), затем
+# пробелы и заглавная буква или цифра - чтобы не резать на "т.е. " и "г. ".
+# Перевод строки - граница всегда.
+_BOUNDARY_RE = re.compile(
+    r"[.!?…]+[\"'»”’)\]]*(\s+)(?=[A-ZА-ЯЁ0-9\"«“(\[])"
+    r"|(\s*\n\s*)"
+)
+
+
+def _split_long(segment: str, separator: str, max_chars: int) -> List[Tuple[str, str]]:
+    """Режет слишком длинный сегмент по пробелам на куски до max_chars"""
+    pieces = []
+    while len(segment) > max_chars:
+        cut = segment.rfind(" ", 1, max_chars + 1)
+        if cut <= 0:
+            pieces.append((segment[:max_chars], ""))
+            segment = segment[max_chars:]
+            continue
+        rest = segment[cut:]
+        stripped = rest.lstrip(" ")
+        pieces.append((segment[:cut], rest[:len(rest) - len(stripped)]))
+        segment = stripped
+    pieces.append((segment, separator))
+    return pieces
+
+
+def split_segments(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """Разбивает текст на пары (сегмент, разделитель после него).
+
+    "".join(сегмент + разделитель) дает исходный текст без изменений,
+    поэтому перевод собирается обратно с теми же пробелами и абзацами.
+    """
+    segments = []
+    start = 0
+    for match in _BOUNDARY_RE.finditer(text):
+        separator_start = match.start(1) if match.group(1) is not None else match.start(2)
+        if separator_start > start:
+            segments.extend(_split_long(text[start:separator_start], text[separator_start:match.end()], max_chars))
+        elif segments:
+            # Пустые строки подряд - добавляем к предыдущему разделителю
+            segment, separator = segments[-1]
+            segments[-1] = (segment, separator + text[separator_start:match.end()])
+        else:
+            segments.append(("", text[separator_start:match.end()]))
+        start = match.end()
+    if start < len(text):
+        segments.extend(_split_long(text[start:], "", max_chars))
+    return segments
+
+
+def join_segments(segments: List[Tuple[str, str]]) -> str:
+    return "".join(segment + separator for segment, separator in segments)
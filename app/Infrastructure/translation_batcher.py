@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+from app.Infrastructure.metrics import TRANSLATION_BATCH_FAILURES, TRANSLATION_BATCH_ITEMS, TRANSLATION_BATCHES
+
+logger = logging.getLogger(__name__)
+
+# Отказ из-за содержимого пачки: одна строка может испортить весь запрос
+ITEM_ERROR_STATUSES = (400, 413, 422)
+
+
+def is_item_error(error: BaseException) -> bool:
+    """Можно ли обойти ошибку пачки, отправив строки по одной.
+
+    429, 5xx, таймауты и обрывы соединения повторятся и на одиночных
+    запросах - их отрабатывает retry с backoff в очереди заданий.
+    """
+    while error is not None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+        if status_code is not None:
+            return status_code in ITEM_ERROR_STATUSES
+        if isinstance(error, (ValueError, KeyError, TypeError)):
+            # Неожиданный ответ: не то число переводов или другой формат
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class _PendingBatch:
+    def __init__(self):
+        # Один и тот же текст в окне отправляется один раз
+        self.futures: Dict[str, List[asyncio.Future]] = {}
+        self.chars = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class TranslationBatcher:
+    """Собирает строки из разных запросов в один вызов провайдера перевода.
+
+    Пачка отправляется по истечении окна или при достижении лимита по
+    количеству строк/символов. Если провайдер отверг саму пачку (400,
+    неожиданный ответ), строки переотправляются по одной, не больше
+    fallback_concurrency сразу, и каждый вызывающий получает свой
+    результат или своё исключение. При перегрузке провайдера (429, 5xx,
+    таймаут) все ожидающие получают исходную ошибку.
+    """
+
+    def __init__(self, client, window_seconds: float, max_items: int, max_chars: int, fallback_concurrency: int = 4):
+        self.client = client
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self.fallback_concurrency = fallback_concurrency
+        self._pending: Dict[Tuple[str, str], _PendingBatch] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self.batches_sent = 0
+        self.items_sent = 0
+
+    async def translate_text(self, text: str, target_lang: str = "en", source_lang: str = "ru") -> Optional[str]:
+        if not text:
+            return None
+
+        key = (source_lang, target_lang)
+        batch = self._pending.get(key)
+        if batch is not None and text not in batch.futures and batch.chars + len(text) > self.max_chars:
+            self._flush(key)
+            batch = None
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch()
+
+        future = asyncio.get_running_loop().create_future()
+        if text not in batch.futures:
+            batch.futures[text] = []
+            batch.chars += len(text)
+        batch.futures[text].append(future)
+
+        if len(batch.futures) >= self.max_items or batch.chars >= self.max_chars:
+            self._flush(key)
+        elif batch.timer is None:
+            batch.timer = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._flush, key
+            )
+
+        return await future
+
+    async def translate_many(self, texts: List[str], target_lang: str = "en", source_lang: str = "ru") -> List[Optional[str]]:
+        return list(await asyncio.gather(
+            *(self.translate_text(text, target_lang, source_lang) for text in texts)
+        ))
+
+    async def close(self) -> None:
+        """Отправляет накопленные строки и дожидается всех вызовов"""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "batches_sent": self.batches_sent,
+            "items_sent": self.items_sent,
+            "avg_batch_size": self.items_sent / self.batches_sent if self.batches_sent else 0.0,
+        }
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._send(key, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, key: Tuple[str, str], batch: _PendingBatch) -> None:
+        source_lang, target_lang = key
+        texts = list(batch.futures)
+        self.batches_sent += 1
+        self.items_sent += len(texts)
+        TRANSLATION_BATCHES.inc()
+        TRANSLATION_BATCH_ITEMS.inc(len(texts))
+
+        try:
+            results = await self.client.translate_batch(texts, target_lang, source_lang)
+            if len(results) != len(texts):
+                raise ValueError(f"Expected {len(texts)} translations, got {len(results)}")
+        except Exception as e:
+            if len(texts) > 1 and is_item_error(e):
+                logger.warning(f"Batch translation of {len(texts)} items was rejected, retrying one by one: {e}")
+                TRANSLATION_BATCH_FAILURES.labels("split").inc()
+                results = await self._send_one_by_one(texts, target_lang, source_lang)
+            else:
+                TRANSLATION_BATCH_FAILURES.labels("failed").inc()
+                results = [e] * len(texts)
+
+        for text, result in zip(texts, results):
+            for future in batch.futures[text]:
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _send_one_by_one(self, texts: List[str], target_lang: str, source_lang: str) -> List:
+        semaphore = asyncio.Semaphore(self.fallback_concurrency)
+
+        async def send(text: str):
+            async with semaphore:
+                return await self.client.translate_text(text, target_lang, source_lang)
+
+        return await asyncio.gather(*(send(text) for text in texts), return_exceptions=True)
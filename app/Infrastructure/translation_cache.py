@@ -0,0 +1,198 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.Infrastructure.database import AsyncSessionLocal
+from app.Infrastructure.metrics import TRANSLATION_CACHE_BYTES_SAVED, TRANSLATION_CACHE_HITS, TRANSLATION_CACHE_MISSES
+from app.Infrastructure.repository.translation_cache_repository import TranslationCacheRepository
+from app.Infrastructure.text_segments import join_segments, split_segments
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_cache_key(source_lang: str, target_lang: str, text: str) -> str:
+    payload = f"{source_lang}\x00{target_lang}\x00{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Двухуровневый кэш переводов: LRU в памяти процесса и таблица в Postgres.
+
+    Ключ - хеш от языковой пары и нормализованного текста, поэтому
+    одинаковые заголовки разных задач переводятся один раз на все воркеры.
+    Попадания, промахи и сэкономленные байты по уровням идут в метрики
+    translation_cache_*; stats() - те же значения в пределах процесса.
+    """
+
+    def __init__(self, max_size: int, persistent: bool = True):
+        self.max_size = max_size
+        self.persistent = persistent
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    async def get_or_translate(
+        self,
+        texts: List[Optional[str]],
+        translator,
+        target_lang: str = "en",
+        source_lang: str = "ru"
+    ) -> List[Optional[str]]:
+        """Возвращает переводы из кэша, недостающие запрашивает у translator"""
+        keys = [make_cache_key(source_lang, target_lang, text) if text else None for text in texts]
+        found: Dict[str, str] = {}
+
+        memory_bytes = 0
+        for key, text in zip(keys, texts):
+            if key is None or key in found:
+                continue
+            cached = self._memory_get(key)
+            if cached is not None:
+                found[key] = cached
+                memory_bytes += len(text.encode("utf-8"))
+        missing = {key: text for key, text in zip(keys, texts) if key is not None and key not in found}
+        self._count("memory", len(found), len(missing), memory_bytes)
+
+        if missing and self.persistent:
+            stored = await self._load(list(missing))
+            db_bytes = 0
+            for key, translated_text in stored.items():
+                self._memory_set(key, translated_text)
+                found[key] = translated_text
+                db_bytes += len(missing.pop(key).encode("utf-8"))
+            self._count("db", len(stored), len(missing), db_bytes)
+
+        if missing:
+            self.misses += len(missing)
+            translated = await translator.translate_many(list(missing.values()), target_lang, source_lang)
+            new_entries = []
+            for key, translated_text in zip(missing, translated):
+                if translated_text is None:
+                    continue
+                found[key] = translated_text
+                self._memory_set(key, translated_text)
+                new_entries.append({
+                    "key": key,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "translated_text": translated_text,
+                })
+            if new_entries and self.persistent:
+                await self._save(new_entries)
+
+        return [found.get(key) if key is not None else None for key in keys]
+
+    async def get_or_translate_segmented(
+        self,
+        texts: List[Optional[str]],
+        translator,
+        target_lang: str = "en",
+        source_lang: str = "ru",
+        max_segment_chars: int = 500
+    ) -> List[Optional[str]]:
+        """Как get_or_translate, но кэширует и переводит каждое предложение отдельно.
+
+        Все сегменты всех текстов проходят через кэш одним вызовом, поэтому
+        провайдер получает только новые или измененные предложения - одной
+        пачкой, которую батчер при необходимости режет на параллельные запросы.
+        """
+        layouts = []
+        cores: List[str] = []
+        for text in texts:
+            if not text:
+                layouts.append(None)
+                continue
+            layout = []
+            for segment, separator in split_segments(text, max_segment_chars):
+                core = segment.strip()
+                # Пробелы по краям сегмента не переводятся и возвращаются как были
+                leading = segment[:len(segment) - len(segment.lstrip())]
+                trailing = segment[len(segment.rstrip()):] if core else ""
+                layout.append((leading, len(cores) if core else None, trailing + separator))
+                if core:
+                    cores.append(core)
+            layouts.append(layout)
+
+        translated = await self.get_or_translate(cores, translator, target_lang, source_lang) if cores else []
+
+        results = []
+        for layout in layouts:
+            if layout is None or any(index is not None and translated[index] is None for _, index, _ in layout):
+                results.append(None)
+                continue
+            results.append(join_segments([
+                (leading + (translated[index] if index is not None else ""), separator)
+                for leading, index, separator in layout
+            ]))
+        return results
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.db_hits
+        total = hits + self.misses
+        return {
+            "memory_size": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / total if total else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def _count(self, tier: str, hits: int, misses: int, bytes_saved: int) -> None:
+        if tier == "memory":
+            self.memory_hits += hits
+        else:
+            self.db_hits += hits
+        self.bytes_saved += bytes_saved
+        if hits:
+            TRANSLATION_CACHE_HITS.labels(tier).inc(hits)
+            TRANSLATION_CACHE_BYTES_SAVED.labels(tier).inc(bytes_saved)
+        if misses:
+            TRANSLATION_CACHE_MISSES.labels(tier).inc(misses)
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: str) -> None:
+        if self.max_size <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    async def _load(self, keys: List[str]) -> Dict[str, str]:
+        try:
+            async with AsyncSessionLocal() as session:
+                return await TranslationCacheRepository(session).get_many(keys)
+        except Exception as e:
+            # Кэш не должен ломать перевод - идем в сеть
+            logger.error(f"Error reading translation cache: {e}")
+            return {}
+
+    async def _save(self, entries: List[dict]) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await TranslationCacheRepository(session).save_many(entries)
+        except Exception as e:
+            logger.error(f"Error writing translation cache: {e}")
+
+
+translation_cache = TranslationCache(
+    max_size=settings.TRANSLATION_CACHE_SIZE,
+    persistent=settings.TRANSLATION_CACHE_PERSISTENT
+)
@@ -1,32 +1,121 @@
-from typing import Optional
-import httpx
+from typing import TYPE_CHECKING, List, Optional
+import logging
+import time
 from fastapi import HTTPException
-import os
+from app.core.config import settings
+from app.Infrastructure.translation_batcher import TranslationBatcher
+from app.Infrastructure.metrics import TRANSLATION_CHARACTERS, TRANSLATION_LATENCY, TRANSLATION_REQUESTS
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client() -> "httpx.AsyncClient":
+    """Создает общий HTTP-клиент с пулом keep-alive соединений"""
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=settings.TRANSLATION_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.TRANSLATION_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.TRANSLATION_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.TRANSLATION_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.TRANSLATION_CONNECT_TIMEOUT,
+            read=settings.TRANSLATION_READ_TIMEOUT,
+            write=settings.TRANSLATION_READ_TIMEOUT,
+            pool=settings.TRANSLATION_CONNECT_TIMEOUT,
+        ),
+    )
+
 
 class TranslationClient:
-    def __init__(self):
-        self.api_key = os.getenv("TRANSLATION_API_KEY")
-        self.base_url = "https://translation.googleapis.com/language/translate/v2"
+    def __init__(self, http_client: "httpx.AsyncClient"):
+        self.http_client = http_client
+        self.api_key = settings.TRANSLATION_API_KEY
+        self.base_url = settings.TRANSLATION_API_URL
 
     async def translate_text(self, text: str, target_lang: str = "en", source_lang: str = "ru") -> Optional[str]:
         if not text:
             return None
-            
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.base_url,
-                    params={
-                        "key": self.api_key,
-                    },
-                    json={
-                        "q": text,
-                        "target": target_lang,
-                        "source": source_lang,
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["data"]["translations"][0]["translatedText"]
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Translation service error: {str(e)}") 
\ No newline at end of file
+
+        translations = await self.translate_batch([text], target_lang, source_lang)
+        return translations[0]
+
+    async def translate_batch(self, texts: List[str], target_lang: str = "en", source_lang: str = "ru") -> List[str]:
+        """Переводит несколько строк одним запросом (несколько значений q)"""
+        TRANSLATION_CHARACTERS.inc(sum(len(text) for text in texts))
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self.http_client.post(
+                self.base_url,
+                params={
+                    "key": self.api_key,
+                },
+                json={
+                    "q": texts,
+                    "target": target_lang,
+                    "source": source_lang,
+                }
+            )
+            response.raise_for_status()
+            result = response.json()
+            translations = [item["translatedText"] for item in result["data"]["translations"]]
+            outcome = "ok"
+            return translations
+        except Exception as e:
+            # Исходная ошибка остается в __cause__: по ней батчер решает,
+            # повторять ли строки пачки по одной
+            raise HTTPException(status_code=500, detail=f"Translation service error: {str(e)}") from e
+        finally:
+            TRANSLATION_LATENCY.labels(outcome).observe(time.perf_counter() - started)
+            TRANSLATION_REQUESTS.labels(outcome).inc()
+
+
+_translation_client: Optional[TranslationClient] = None
+_translation_batcher: Optional[TranslationBatcher] = None
+
+
+def _ensure_translation_client() -> None:
+    # Без await между проверкой и присваиванием: в одном event loop два
+    # первых вызова не могут создать клиент дважды
+    global _translation_client, _translation_batcher
+    if _translation_client is None:
+        logger.info("Creating translation HTTP client...")
+        _translation_client = TranslationClient(create_http_client())
+        _translation_batcher = TranslationBatcher(
+            _translation_client,
+            window_seconds=settings.TRANSLATION_BATCH_WINDOW_MS / 1000,
+            max_items=settings.TRANSLATION_BATCH_MAX_ITEMS,
+            max_chars=settings.TRANSLATION_BATCH_MAX_CHARS,
+            fallback_concurrency=settings.TRANSLATION_BATCH_FALLBACK_CONCURRENCY,
+        )
+
+
+async def init_translation_client():
+    _ensure_translation_client()
+
+
+async def close_translation_client():
+    global _translation_client, _translation_batcher
+    if _translation_batcher is not None:
+        await _translation_batcher.close()
+        _translation_batcher = None
+    if _translation_client is not None:
+        logger.info("Closing translation HTTP client...")
+        await _translation_client.http_client.aclose()
+        _translation_client = None
+
+
+def get_translation_client() -> TranslationClient:
+    _ensure_translation_client()
+    return _translation_client
+
+
+def get_translation_batcher() -> TranslationBatcher:
+    _ensure_translation_client()
+    return _translation_batcher
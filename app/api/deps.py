@@ -1,17 +1,69 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.application.auth_services import TokenService, UserAuthService
-from app.Infrastructure.database import AsyncSessionLocal
+from app.application.task_services import TaskService
+from app.application.import_services import TaskImportService
+from app.Infrastructure.database import get_db
 from app.Infrastructure.repository.user_repository import UserRepository
+from app.Infrastructure.repository.task_repository import TaskRepository
+from app.Infrastructure.repository.translation_job_repository import TranslationJobRepository
+from app.Infrastructure.repository.task_import_repository import TaskImportRepository
+from app.Infrastructure.principal_cache import principal_cache
+from app.Infrastructure.query_tracker import current_stats
+from app.domain.value_objects.principal import Principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+# Все зависимости ниже получают одну и ту же сессию запроса из get_db:
+# FastAPI кэширует зависимость в пределах запроса, коммит - один, в конце.
+
+def get_user_repository(session: AsyncSession = Depends(get_db)) -> UserRepository:
+    return UserRepository(session)
+
+def get_auth_service(user_repo: UserRepository = Depends(get_user_repository)) -> UserAuthService:
+    return UserAuthService(user_repo)
+
+def get_task_repository(session: AsyncSession = Depends(get_db)) -> TaskRepository:
+    return TaskRepository(session)
+
+def get_translation_job_repository(session: AsyncSession = Depends(get_db)) -> TranslationJobRepository:
+    return TranslationJobRepository(session)
+
+def get_task_service(
+    task_repo: TaskRepository = Depends(get_task_repository),
+    job_repo: TranslationJobRepository = Depends(get_translation_job_repository)
+) -> TaskService:
+    return TaskService(task_repo, job_repo)
+
+def get_import_service(
+    session: AsyncSession = Depends(get_db),
+    job_repo: TranslationJobRepository = Depends(get_translation_job_repository)
+) -> TaskImportService:
+    return TaskImportService(TaskImportRepository(session), job_repo)
+
+def query_budget(limit: int):
+    """Бюджет запросов к БД для маршрута: dependencies=[Depends(query_budget(3))]"""
+    def set_budget():
+        stats = current_stats()
+        if stats is not None:
+            stats.budget = limit
+    return set_budget
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    auth_service: UserAuthService = Depends(get_auth_service)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+    # Повторный запрос с тем же токеном обходится без jwt.decode и SELECT
+    cached_principal = principal_cache.get(token)
+    if cached_principal is not None:
+        return cached_principal
     
     try:
         token_data = TokenService.verify_token(token)
@@ -20,10 +72,12 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except:
         raise credentials_exception
         
-    async with AsyncSessionLocal() as session:
-        user_repo = UserRepository(session)
-        auth_service = UserAuthService(user_repo)
-        user = await auth_service.get_user(token_data.username)
-        if user is None:
-            raise credentials_exception
-        return user 
\ No newline at end of file
+    # Номер берётся до SELECT: снимок, загруженный до invalidate_user,
+    # не попадёт в кэш
+    generation = principal_cache.generation()
+    user = await auth_service.get_user(token_data.username)
+    if user is None or not user.is_active:
+        raise credentials_exception
+    principal = Principal.model_validate(user)
+    principal_cache.set(token, principal, generation, token_data.exp)
+    return principal
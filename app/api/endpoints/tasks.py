@@ -1,96 +1,226 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from typing import List
-from app.domain.schemas.task import TaskCreate, TaskResponse, TaskUpdate
-from app.application.task_services import TaskService
-from app.application.translation_services import TranslationService
-from app.Infrastructure.repository.task_repository import TaskRepository
-from app.Infrastructure.translation_client import TranslationClient
-from app.Infrastructure.database import AsyncSessionLocal
-from app.api.deps import get_current_user
-from app.domain.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from datetime import datetime
+from app.domain.schemas.task import (
+    TaskCreate, TaskPage, TaskResponse, TaskUpdate, TaskBatchRequest, TaskBatchResponse,
+    TaskImportResponse, TaskSearchPage
+)
+from app.application.task_services import TaskService, SOURCE_LANGUAGE
+from app.application.export_services import TaskExportService
+from app.application.import_services import TaskImportService
+from app.api.deps import get_current_user, get_task_service, get_import_service, query_budget
+from app.api.conditional import make_etag, etag_matches
+from app.api.responses import FastJSONResponse
+from app.domain.value_objects.principal import Principal
+from app.core.config import settings
 
 tasks_router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+
+def _cache_headers(etag: str) -> dict:
+    # Клиент хранит ответ, но каждый раз перепроверяет его по ETag
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _render(payload, headers: Optional[dict] = None):
+    """Строки из репозитория уже валидны - в быстром режиме отдаем их как есть"""
+    if settings.TASKS_FAST_SERIALIZATION:
+        return FastJSONResponse(payload, headers=headers)
+    return payload
+
+
 @tasks_router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreate,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    check_conflicts: bool = False,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
 ):
-    async with AsyncSessionLocal() as session:
-        task_repo = TaskRepository(session)
-        translation_client = TranslationClient()
-        translation_service = TranslationService(task_repo, translation_client)
-        task_service = TaskService(task_repo, translation_service)
-        
-        return await task_service.create_task(
-            user_id=current_user.id,
-            title=task_data.title,
-            description=task_data.description,
-            start_time=task_data.start_time,
-            end_time=task_data.end_time,
-            background_tasks=background_tasks,
-            auto_translate=task_data.auto_translate
+    return await task_service.create_task(
+        user_id=current_user.id,
+        title=task_data.title,
+        description=task_data.description,
+        start_time=task_data.start_time,
+        end_time=task_data.end_time,
+        auto_translate=task_data.auto_translate,
+        check_conflicts=check_conflicts
+    )
+
+@tasks_router.post("/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
+):
+    total = len(batch.create) + len(batch.update) + len(batch.delete)
+    if total > settings.TASKS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch is limited to {settings.TASKS_BATCH_MAX_ITEMS} items"
         )
 
-@tasks_router.get("", response_model=List[TaskResponse])
+    results = await task_service.apply_batch(
+        current_user.id, batch.create, batch.update, batch.delete
+    )
+    return TaskBatchResponse(results=results)
+
+@tasks_router.get("/export")
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    language: Optional[str] = None,
+    gzip: bool = False,
+    current_user: Principal = Depends(get_current_user)
+):
+    if language == SOURCE_LANGUAGE:
+        language = None
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"tasks.{format}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        TaskExportService().export(current_user.id, format, language, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@tasks_router.post("/import", response_model=TaskImportResponse)
+async def import_tasks(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    import_id: Optional[int] = None,
+    translate: bool = False,
+    current_user: Principal = Depends(get_current_user),
+    import_service: TaskImportService = Depends(get_import_service)
+):
+    """Импорт из тела запроса потоком; import_id продолжает прерванный импорт"""
+    task_import = await import_service.start(current_user.id, import_id)
+    if task_import is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return await import_service.run(task_import, request.stream(), format, translate)
+
+@tasks_router.get("/search", response_model=TaskSearchPage, dependencies=[Depends(query_budget(2))])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=255),
+    language: str = "ru",
+    limit: int = Query(settings.TASKS_PAGE_SIZE_DEFAULT, ge=1, le=settings.TASKS_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
+):
+    try:
+        items, next_cursor = await task_service.search_tasks(
+            current_user.id, q, language, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _render({"items": items, "next_cursor": next_cursor})
+
+@tasks_router.get("/overlaps", response_model=List[TaskResponse], dependencies=[Depends(query_budget(2))])
+async def get_overlapping_tasks(
+    start_time: datetime,
+    end_time: datetime,
+    language: str = "ru",
+    limit: int = Query(settings.TASKS_PAGE_SIZE_DEFAULT, ge=1, le=settings.TASKS_PAGE_SIZE_MAX),
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
+):
+    try:
+        items = await task_service.get_overlapping_tasks(
+            current_user.id, start_time, end_time, language, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _render(items)
+
+@tasks_router.get("", response_model=TaskPage, dependencies=[Depends(query_budget(3))])
 async def get_tasks(
+    request: Request,
+    response: Response,
     language: str = "ru",
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(settings.TASKS_PAGE_SIZE_DEFAULT, ge=1, le=settings.TASKS_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    end_to: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    has_translation: Optional[bool] = None,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
 ):
-    async with AsyncSessionLocal() as session:
-        task_repo = TaskRepository(session)
-        translation_service = TranslationService(task_repo, TranslationClient())
-        task_service = TaskService(task_repo, translation_service)
-        
-        return await task_service.get_tasks(current_user.id, language)
+    # Версия списка считается агрегатом; при совпадении строки не читаются
+    version = await task_service.get_tasks_version(current_user.id)
+    etag = make_etag("tasks", current_user.id, *version, request.url.query)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+    response.headers.update(_cache_headers(etag))
+    
+    try:
+        items, next_cursor = await task_service.get_tasks(
+            current_user.id,
+            language,
+            limit=limit,
+            cursor=cursor,
+            start_from=start_from,
+            end_to=end_to,
+            updated_since=updated_since,
+            has_translation=has_translation
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _render({"items": items, "next_cursor": next_cursor}, _cache_headers(etag))
 
-@tasks_router.get("/{task_id}", response_model=TaskResponse)
+@tasks_router.get("/{task_id}", response_model=TaskResponse, dependencies=[Depends(query_budget(3))])
 async def get_task(
     task_id: int,
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    language: str = "ru",
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
 ):
-    async with AsyncSessionLocal() as session:
-        task_repo = TaskRepository(session)
-        task = await task_repo.get_task_by_id(task_id)
-        if not task or task.user_id != current_user.id:
-            raise HTTPException(status_code=404, detail="Task not found")
-        return task
+    version = await task_service.get_task_version(task_id, current_user.id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    etag = make_etag("task", task_id, *version, language)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+    response.headers.update(_cache_headers(etag))
+    
+    task = await task_service.get_task(task_id, current_user.id, language)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return _render(task, _cache_headers(etag))
 
 @tasks_router.patch("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    check_conflicts: bool = False,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
 ):
-    async with AsyncSessionLocal() as session:
-        task_repo = TaskRepository(session)
-        translation_service = TranslationService(task_repo, TranslationClient())
-        task_service = TaskService(task_repo, translation_service)
+    if not await task_service.get_owned_task(task_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Task not found")
         
-        task = await task_repo.get_task_by_id(task_id)
-        if not task or task.user_id != current_user.id:
-            raise HTTPException(status_code=404, detail="Task not found")
-            
+    try:
         return await task_service.update_task(
             task_id=task_id,
-            background_tasks=background_tasks,
+            check_conflicts=check_conflicts,
             **task_data.model_dump(exclude_unset=True)
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
 @tasks_router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service)
 ):
-    async with AsyncSessionLocal() as session:
-        task_repo = TaskRepository(session)
-        task_service = TaskService(task_repo, TranslationService(task_repo, TranslationClient()))
+    if not await task_service.get_owned_task(task_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Task not found")
         
-        task = await task_repo.get_task_by_id(task_id)
-        if not task or task.user_id != current_user.id:
-            raise HTTPException(status_code=404, detail="Task not found")
-            
-        if not await task_service.delete_task(task_id):
-            raise HTTPException(status_code=500, detail="Error deleting task")
+    if not await task_service.delete_task(task_id):
+        raise HTTPException(status_code=500, detail="Error deleting task")
@@ -0,0 +1,215 @@
+import hashlib
+import logging
+import math
+import time
+from typing import Optional
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.Infrastructure.admission import ConcurrencyLimiter, TokenBucketLimiter
+from app.Infrastructure.metrics import (
+    ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED,
+    HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS
+)
+from app.Infrastructure.query_tracker import (
+    QueryBudgetExceeded, compact_statement, current_stats, start_tracking, stop_tracking
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """ASGI-middleware с метриками запросов.
+
+    Метка route - шаблон пути (/api/v1/tasks/{task_id}), а не сам путь,
+    чтобы число временных рядов не росло с числом задач.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_PROGRESS.labels(method).dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "<unmatched>"
+            HTTP_LATENCY.labels(method, route_path).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+
+
+class QueryTrackingMiddleware:
+    """Считает запросы к БД на каждый HTTP-запрос.
+
+    Предупреждает о повторяющихся запросах (N+1) и о превышении бюджета
+    маршрута (см. deps.query_budget); в режиме DEBUG добавляет в ответ
+    заголовки X-DB-Query-Count и Server-Timing. С QUERY_BUDGET_STRICT
+    превышение проверяется до отправки ответа и превращается в 500.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_tracking(settings.QUERY_BUDGET_DEFAULT)
+        stats = current_stats()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Для потоковых ответов - запросы, сделанные до первого байта
+                if settings.QUERY_BUDGET_STRICT and stats.count > stats.budget:
+                    # Ответ еще не начат: исключение дойдет до
+                    # ServerErrorMiddleware, и клиент получит 500
+                    raise QueryBudgetExceeded(self.budget_message(scope, stats))
+                if settings.DEBUG:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"server-timing", f"db;dur={stats.total_time * 1000:.1f}".encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_tracking(token)
+
+        for statement, count in stats.repeated(settings.QUERY_REPEAT_THRESHOLD):
+            logger.warning(
+                f"Possible N+1 in {self.request_name(scope)}: statement executed {count} times: "
+                f"{compact_statement(statement)}"
+            )
+        if stats.count > stats.budget:
+            logger.warning(self.budget_message(scope, stats))
+
+    @staticmethod
+    def request_name(scope) -> str:
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        return f"{scope['method']} {route}"
+
+    @classmethod
+    def budget_message(cls, scope, stats) -> str:
+        return f"{cls.request_name(scope)} made {stats.count} queries, budget is {stats.budget}"
+
+
+class AdmissionControlMiddleware:
+    """Сброс нагрузки до того, как запрос займет event loop и пул БД.
+
+    Запросы делятся на группы (auth, task_reads, task_writes), у каждой
+    свой лимит одновременных запросов и ограниченная очередь. Не
+    попавший в очередь или не дождавшийся слота запрос сразу получает
+    503 с Retry-After. Опционально - token bucket на Bearer-токен,
+    при исчерпании - 429.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.limiters = {
+            "auth": ConcurrencyLimiter(
+                settings.ADMISSION_AUTH_CONCURRENCY,
+                settings.ADMISSION_QUEUE_LIMIT,
+                settings.ADMISSION_QUEUE_TIMEOUT
+            ),
+            "task_reads": ConcurrencyLimiter(
+                settings.ADMISSION_TASK_READ_CONCURRENCY,
+                settings.ADMISSION_QUEUE_LIMIT,
+                settings.ADMISSION_QUEUE_TIMEOUT
+            ),
+            "task_writes": ConcurrencyLimiter(
+                settings.ADMISSION_TASK_WRITE_CONCURRENCY,
+                settings.ADMISSION_QUEUE_LIMIT,
+                settings.ADMISSION_QUEUE_TIMEOUT
+            ),
+        }
+        self.rate_limiter = None
+        if settings.RATE_LIMIT_ENABLED:
+            # Запросы пользователя расходятся по воркерам, у каждого своя корзина
+            self.rate_limiter = TokenBucketLimiter(
+                rate=settings.RATE_LIMIT_PER_SECOND / max(1, settings.WEB_CONCURRENCY),
+                burst=max(1, settings.RATE_LIMIT_BURST // max(1, settings.WEB_CONCURRENCY)),
+                max_keys=settings.RATE_LIMIT_MAX_PRINCIPALS
+            )
+
+    @staticmethod
+    def route_group(method: str, path: str) -> Optional[str]:
+        if path.startswith("/api/v1/auth"):
+            return "auth"
+        if path.startswith("/api/v1/tasks"):
+            return "task_reads" if method in ("GET", "HEAD") else "task_writes"
+        return None
+
+    @staticmethod
+    def principal(scope) -> Optional[str]:
+        """Ключ корзины - хэш сырого токена, без jwt.decode на каждый запрос.
+
+        Подпись здесь не проверяется: невалидный токен отклонит
+        get_current_user, а корзина на него лишь ограничит перебор.
+        """
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.partition(b" ")
+                if scheme.lower() != b"bearer" or not token:
+                    return None
+                return hashlib.sha256(token).hexdigest()
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group = self.route_group(scope["method"], scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            principal = self.principal(scope)
+            retry_after = self.rate_limiter.acquire(principal) if principal else None
+            if retry_after is not None:
+                ADMISSION_REJECTED.labels(group, "rate_limited").inc()
+                await self._reject(scope, receive, send, 429, "Rate limit exceeded", retry_after)
+                return
+
+        limiter = self.limiters[group]
+        started = time.perf_counter()
+        if not await limiter.acquire():
+            reason = "queue_full" if limiter.waiting >= limiter.queue_limit else "queue_timeout"
+            ADMISSION_REJECTED.labels(group, reason).inc()
+            await self._reject(scope, receive, send, 503, "Server is overloaded", limiter.queue_timeout)
+            return
+
+        ADMISSION_QUEUE_WAIT.labels(group).observe(time.perf_counter() - started)
+        ADMISSION_IN_FLIGHT.labels(group).inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ADMISSION_IN_FLIGHT.labels(group).dec()
+            limiter.release()
+
+    @staticmethod
+    async def _reject(scope, receive, send, status_code: int, detail: str, retry_after: float) -> None:
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=status_code,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
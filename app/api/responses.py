@@ -0,0 +1,33 @@
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ставится вместе с fastapi[all]
+    orjson = None
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ без повторной валидации через Pydantic.
+
+    Предназначен для данных, которые уже пришли из нашей БД в виде
+    простых dict; кодирует через orjson, если он установлен.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_json_default
+        ).encode("utf-8")
@@ -1,19 +1,16 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi.security import OAuth2PasswordBearer
 from app.domain.schemas.token import Token, TokenData
 from app.core.security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
-from passlib.context import CryptContext
-from sqlalchemy import select 
-from app.Infrastructure.database import AsyncSessionLocal
 from jose import jwt
 from fastapi import HTTPException, status
 from app.domain.models.user import User
+from app.Infrastructure.repository.user_repository import UserRepository
 from app.domain.schemas.user import UserCreate
+from app.Infrastructure.password_hasher import get_pwd_context, password_hasher
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 class SecurityService:
@@ -21,11 +18,21 @@ class SecurityService:
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return get_pwd_context().verify(plain_password, hashed_password)
         
     @staticmethod
     def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
+        return get_pwd_context().hash(password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Проверка пароля в пуле хеширования, без блокировки event loop"""
+        return await password_hasher.verify(plain_password, hashed_password)
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        """Хеширование пароля в пуле хеширования, без блокировки event loop"""
+        return await password_hasher.hash(password)
 
 class TokenService:
     """Сервис для работы с токенами"""
@@ -58,7 +65,11 @@ class TokenService:
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid token payload"
                 )
-            return TokenData(username=username)
+            exp = payload.get("exp")
+            return TokenData(
+                username=username,
+                exp=datetime.fromtimestamp(exp, tz=timezone.utc) if exp else None
+            )
         except jwt.JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,47 +79,32 @@ class TokenService:
 
 class UserAuthService:
     """Сервис аутентификации пользователей"""
+
+    def __init__(self, user_repo: UserRepository):
+        self.user_repo = user_repo
     
-    @staticmethod
-    async def authenticate_user(username: str, password: str) -> Optional[User]:
-        user = await UserAuthService.get_user(username)
-        if not user or not SecurityService.verify_password(password, user.password_hash):
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
+        user = await self.get_user(username)
+        if not user or not await SecurityService.verify_password_async(password, user.password_hash):
             return None
         return user
     
-    @staticmethod
-    async def get_user(username: str) -> Optional[User]:
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(select(User).where(User.username == username))
-            return result.scalar_one_or_none()
+    async def get_user(self, username: str) -> Optional[User]:
+        return await self.user_repo.get_user_by_username(username)
             
-    @staticmethod
-    async def create_user(user_data: UserCreate) -> User:
-        async with AsyncSessionLocal() as db:
-            # Проверка существования пользователя
-            existing_user = await db.execute(
-                select(User).where(
-                    (User.username == user_data.username) | 
-                    (User.email == user_data.email)
-                )
-            )
-            if existing_user.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Username or email already registered"
-                )
-            
-            # Создание нового пользователя
-            hashed_password = SecurityService.get_password_hash(user_data.password)
-            new_user = User(
-                username=user_data.username,
-                email=user_data.email,
-                password_hash=hashed_password
+    async def create_user(self, user_data: UserCreate) -> User:
+        # Проверка существования пользователя
+        if await self.user_repo.username_or_email_taken(user_data.username, user_data.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username or email already registered"
             )
-            db.add(new_user)
-            await db.commit()
-            await db.refresh(new_user)
-            return new_user
-
-
-
+        
+        # Создание нового пользователя; коммит делает единица работы запроса
+        hashed_password = await SecurityService.get_password_hash_async(user_data.password)
+        return await self.user_repo.create_user(
+            username=user_data.username,
+            email=user_data.email,
+            password_hash=hashed_password,
+            commit=False
+        )
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from app.core.config import settings
+from app.Infrastructure.database import AsyncSessionLocal, allow_replica_reads
+from app.Infrastructure.repository.task_repository import TaskRepository
+
+EXPORT_FIELDS = ["id", "title", "description", "start_time", "end_time", "created_at", "updated_at"]
+TRANSLATED_FIELDS = ["translated_title", "translated_description"]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+class TaskExportService:
+    """Потоковая выгрузка задач пользователя в NDJSON или CSV.
+
+    Сессия открывается внутри генератора и живет, пока идет ответ;
+    память ограничена одной пачкой строк независимо от числа задач.
+    """
+
+    def __init__(self, chunk_size: int = settings.TASKS_EXPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    async def export(
+        self,
+        user_id: int,
+        export_format: str = "ndjson",
+        language: Optional[str] = None,
+        compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        encode = self._encode_csv if export_format == "csv" else self._encode_ndjson
+        fields = EXPORT_FIELDS + (TRANSLATED_FIELDS if language else [])
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        if export_format == "csv":
+            yield self._compress(compressor, self._csv_header(fields))
+
+        async with AsyncSessionLocal() as session:
+            allow_replica_reads(session)
+            task_repo = TaskRepository(session)
+            async for rows in task_repo.stream_tasks(user_id, self.chunk_size, language):
+                chunk = self._compress(compressor, encode(rows, fields))
+                if chunk:
+                    yield chunk
+
+        if compressor is not None:
+            yield compressor.flush()
+
+    @staticmethod
+    def _compress(compressor, data: bytes) -> bytes:
+        return compressor.compress(data) if compressor is not None else data
+
+    @staticmethod
+    def _encode_ndjson(rows: List[dict], fields: List[str]) -> bytes:
+        return "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in rows
+        ).encode("utf-8")
+
+    @staticmethod
+    def _csv_header(fields: List[str]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        return buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _encode_csv(rows: List[dict], fields: List[str]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        for row in rows:
+            writer.writerow({
+                key: value.isoformat() if isinstance(value, datetime) else value
+                for key, value in row.items()
+            })
+        return buffer.getvalue().encode("utf-8")
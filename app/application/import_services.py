@@ -0,0 +1,183 @@
+import csv
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from app.core.config import settings
+from app.domain.models.task_import import TaskImport
+from app.domain.schemas.task import TaskBase
+from app.domain.value_objects.time_interval import TimeInterval
+from app.Infrastructure.repository.task_import_repository import TaskImportRepository
+from app.Infrastructure.repository.translation_job_repository import TranslationJobRepository
+
+logger = logging.getLogger(__name__)
+
+CSV_COLUMNS = ["title", "description", "start_time", "end_time"]
+
+
+def decode_line(line: bytes) -> Optional[str]:
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """Режет поток байтов на строки, не читая его целиком.
+
+    Строки декодируются по одной: не UTF-8 строка приходит как None
+    и становится ошибкой строки, а не всего импорта.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield decode_line(line)
+    if buffer:
+        yield decode_line(buffer)
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Optional[dict]]:
+    async for line in lines:
+        if line is None:
+            yield None
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+async def iter_csv_rows(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Optional[dict]]:
+    header = None
+    pending = ""
+    async for line in lines:
+        if line is None:
+            if header is None:
+                raise ValueError("CSV header is not valid UTF-8")
+            # Битая строка портит и начатую многострочную запись
+            pending = ""
+            yield None
+            continue
+        pending = f"{pending}\n{line}" if pending else line
+        # Запись в кавычках может занимать несколько строк
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = values
+            continue
+        yield dict(zip(header, values)) if len(values) == len(header) else None
+
+
+class TaskImportService:
+    """Массовый импорт задач через COPY во временную таблицу.
+
+    Строки проверяются пачками по правилам TaskBase и TimeInterval,
+    валидные уходят в Postgres через copy_records_to_table и сливаются
+    в tasks. Чекпоинт фиксируется в той же транзакции, что и пачка,
+    поэтому прерванный импорт можно продолжить с тем же import_id.
+    """
+
+    def __init__(
+        self,
+        import_repo: TaskImportRepository,
+        job_repo: TranslationJobRepository,
+        chunk_size: int = settings.TASKS_IMPORT_CHUNK_SIZE,
+        max_errors: int = settings.TASKS_IMPORT_MAX_ERRORS
+    ):
+        self.import_repo = import_repo
+        self.job_repo = job_repo
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    async def start(self, user_id: int, import_id: Optional[int] = None) -> Optional[TaskImport]:
+        if import_id is None:
+            return await self.import_repo.create_import(user_id)
+        return await self.import_repo.get_import(import_id, user_id)
+
+    async def run(
+        self,
+        task_import: TaskImport,
+        chunks: AsyncIterator[bytes],
+        source_format: str = "ndjson",
+        translate: bool = False
+    ) -> TaskImport:
+        parse = iter_csv_rows if source_format == "csv" else iter_ndjson_rows
+        resume_after = task_import.rows_processed
+        row_number = 0
+        batch: List[Tuple[int, Optional[dict]]] = []
+
+        try:
+            async for row in parse(iter_lines(chunks)):
+                row_number += 1
+                if row_number <= resume_after:
+                    continue
+                batch.append((row_number, row))
+                if len(batch) >= self.chunk_size:
+                    await self._flush(task_import, batch, translate)
+                    batch = []
+            if batch:
+                await self._flush(task_import, batch, translate)
+        except Exception:
+            session = self.import_repo.session
+            await session.rollback()
+            # rollback expire-ит task_import, а ленивая загрузка атрибута
+            # в async-сессии падает с MissingGreenlet: перечитываем
+            # последний зафиксированный чекпоинт явно
+            await session.refresh(task_import)
+            await self.import_repo.finish(task_import, TaskImport.STATUS_FAILED)
+            raise
+
+        await self.import_repo.finish(task_import, TaskImport.STATUS_COMPLETED)
+        return task_import
+
+    async def _flush(self, task_import: TaskImport, batch: List[Tuple[int, Optional[dict]]], translate: bool) -> None:
+        records, errors = self._validate(task_import.user_id, batch)
+        inserted_ids = await self.import_repo.copy_and_merge(records) if records else []
+        if translate:
+            await self.job_repo.enqueue_many(inserted_ids, commit=False)
+        await self.import_repo.save_checkpoint(
+            task_import,
+            rows_processed=batch[-1][0],
+            imported=len(inserted_ids),
+            skipped=len(records) - len(inserted_ids),
+            errors=errors,
+            max_errors=self.max_errors
+        )
+
+    @staticmethod
+    def _validate(user_id: int, batch: List[Tuple[int, Optional[dict]]]) -> Tuple[List[Tuple], List[Dict]]:
+        records = []
+        errors = []
+        for row_number, row in batch:
+            if row is None:
+                errors.append({"row": row_number, "error": "Malformed row"})
+                continue
+            try:
+                data = TaskBase.model_validate({
+                    key: value if value != "" else None
+                    for key, value in row.items() if key in CSV_COLUMNS
+                })
+                TimeInterval(start_time=data.start_time, end_time=data.end_time).validate()
+            except ValidationError as e:
+                errors.append({
+                    "row": row_number,
+                    "error": "; ".join(
+                        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+                        for detail in e.errors()
+                    )
+                })
+                continue
+            except ValueError as e:
+                errors.append({"row": row_number, "error": str(e)})
+                continue
+            records.append((user_id, data.title, data.description, data.start_time, data.end_time))
+        return records, errors
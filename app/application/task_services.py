@@ -1,14 +1,20 @@
 from app.Infrastructure.repository.task_repository import TaskRepository
-from app.application.translation_services import TranslationService
+from app.Infrastructure.repository.translation_job_repository import TranslationJobRepository
 from app.domain.models.task import Task
-from app.domain.value_objects.time_interval import TimeInterval
-from typing import List, Optional
-from fastapi import BackgroundTasks
+from app.domain.value_objects.time_interval import TimeInterval, as_utc
+from app.domain.value_objects.task_cursor import TaskCursor, TaskSearchCursor
+from app.domain.schemas.task import TaskCreate, TaskBatchUpdate, TaskBatchItemResult
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from pydantic import ValidationError
+from fastapi import HTTPException, status
+
+SOURCE_LANGUAGE = "ru"
 
 class TaskService:
-    def __init__(self, task_repo: TaskRepository, translation_service: TranslationService):
+    def __init__(self, task_repo: TaskRepository, job_repo: TranslationJobRepository):
         self.task_repo = task_repo
-        self.translation_service = translation_service
+        self.job_repo = job_repo
 
     async def create_task(
         self, 
@@ -17,12 +23,14 @@ class TaskService:
         description: str, 
         start_time: str, 
         end_time: str,
-        background_tasks: BackgroundTasks,
-        auto_translate: bool = True
+        auto_translate: bool = True,
+        check_conflicts: bool = False
     ) -> Task:
         # Проверяем временной интервал
         time_interval = TimeInterval(start_time=start_time, end_time=end_time)
         time_interval.validate()
+        if check_conflicts:
+            await self._ensure_no_conflicts(user_id, time_interval.start_time, time_interval.end_time)
         
         # Создаем задачу
         task = Task(
@@ -30,47 +38,297 @@ class TaskService:
             title=title,
             description=description,
             start_time=start_time,
-            end_time=end_time
+            end_time=end_time,
+            translations=[]
         )
-        created_task = await self.task_repo.create_task(task)
+        created_task = await self.task_repo.create_task(task, commit=False)
         
-        # Если включен автоперевод, добавляем задачу на перевод в фоновые задачи
+        # Задание на перевод фиксируется в той же транзакции, что и задача
         if auto_translate:
-            background_tasks.add_task(
-                self.translation_service.translate_and_save_task,
-                created_task.id
-            )
+            await self.job_repo.enqueue(created_task.id, commit=False)
             
         return created_task
 
     async def get_tasks(
         self, 
         user_id: int, 
-        language: str = "ru"
-    ) -> List[Task]:
-        tasks = await self.task_repo.get_tasks_by_user(user_id)
+        language: str = "ru",
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        start_from: Optional[datetime] = None,
+        end_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        has_translation: Optional[bool] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        after = TaskCursor.decode(cursor) if cursor else None
+        # Лишняя строка показывает, есть ли следующая страница
+        tasks = await self.task_repo.get_tasks_page(
+            user_id,
+            limit + 1,
+            language=self._projection_language(language),
+            after=after,
+            start_from=start_from,
+            end_to=end_to,
+            updated_since=updated_since,
+            has_translation=has_translation
+        )
         
-        # Если запрошен английский язык, возвращаем с переводами
-        if language == "en":
-            return [task.with_english_translation() for task in tasks]
-        return tasks
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            last = tasks[-1]
+            next_cursor = TaskCursor(start_time=last["start_time"], id=last["id"]).encode()
+        return tasks, next_cursor
+
+    async def get_tasks_version(self, user_id: int) -> tuple:
+        """Версия списка задач пользователя для ETag"""
+        return await self.task_repo.get_tasks_version(user_id)
+
+    async def get_task_version(self, task_id: int, user_id: int) -> Optional[tuple]:
+        """Версия задачи и ее переводов для ETag; None, если задачи нет"""
+        return await self.task_repo.get_task_version(task_id, user_id)
+
+    async def get_task(self, task_id: int, user_id: int, language: str = "ru") -> Optional[Dict]:
+        return await self.task_repo.get_task_view(
+            task_id, user_id, self._projection_language(language)
+        )
+
+    @staticmethod
+    def _projection_language(language: str) -> Optional[str]:
+        # Задачи хранятся на русском - для него перевод не нужен
+        return None if language == SOURCE_LANGUAGE else language
 
     async def update_task(
         self, 
         task_id: int, 
-        background_tasks: BackgroundTasks,
+        check_conflicts: bool = False,
         **kwargs
     ) -> Optional[Task]:
-        updated_task = await self.task_repo.update_task(task_id, **kwargs)
+        if "start_time" in kwargs or "end_time" in kwargs:
+            # В БД интервал с часовым поясом, наивное время с ним не сравнить
+            for field in ("start_time", "end_time"):
+                if kwargs.get(field) is not None:
+                    kwargs[field] = as_utc(kwargs[field])
+            task = await self.task_repo.get_task_by_id(task_id)
+            if task:
+                # Перевернутый интервал иначе упадет на tstzrange в индексе
+                time_interval = TimeInterval(
+                    start_time=kwargs.get("start_time", task.start_time),
+                    end_time=kwargs.get("end_time", task.end_time)
+                )
+                time_interval.validate()
+                if check_conflicts:
+                    await self._ensure_no_conflicts(
+                        task.user_id, time_interval.start_time, time_interval.end_time, exclude_task_id=task_id
+                    )
+
+        updated_task = await self.task_repo.update_task(task_id, commit=False, **kwargs)
         
-        # Если обновили заголовок или описание, запускаем перевод
+        # Если обновили заголовок или описание, ставим задачу на перевод
         if updated_task and ("title" in kwargs or "description" in kwargs):
-            background_tasks.add_task(
-                self.translation_service.translate_and_save_task,
-                task_id
-            )
+            await self.job_repo.enqueue(task_id, commit=False)
             
         return updated_task
 
+    async def search_tasks(
+        self,
+        user_id: int,
+        query_text: str,
+        language: str = "ru",
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        after = TaskSearchCursor.decode(cursor) if cursor else None
+        hits = await self.task_repo.search_tasks(
+            user_id, query_text, limit + 1, self._projection_language(language), after
+        )
+        
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            last = hits[-1]
+            next_cursor = TaskSearchCursor(rank=last["rank"], id=last["id"]).encode()
+        return hits, next_cursor
+
+    async def get_overlapping_tasks(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        language: str = "ru",
+        limit: int = 100
+    ) -> List[Dict]:
+        TimeInterval(start_time=start_time, end_time=end_time).validate()
+        return await self.task_repo.get_overlapping_tasks(
+            user_id, start_time, end_time, limit, self._projection_language(language)
+        )
+
+    async def _ensure_no_conflicts(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_task_id: Optional[int] = None
+    ) -> None:
+        conflicts = await self.task_repo.find_conflicts(user_id, start_time, end_time, exclude_task_id)
+        if conflicts:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Task overlaps with existing tasks",
+                    "conflicting_task_ids": conflicts
+                }
+            )
+
+    async def get_owned_task(self, task_id: int, user_id: int) -> Optional[Task]:
+        task = await self.task_repo.get_task_by_id(task_id)
+        if not task or task.user_id != user_id:
+            return None
+        return task
+
     async def delete_task(self, task_id: int) -> bool:
-        return await self.task_repo.delete_task(task_id)
+        return await self.task_repo.delete_task(task_id, commit=False)
+
+    async def apply_batch(
+        self,
+        user_id: int,
+        create: List[Dict[str, Any]],
+        update: List[Dict[str, Any]],
+        delete: List[int]
+    ) -> List[TaskBatchItemResult]:
+        """Создание, изменение и удаление задач пачкой в одной транзакции.
+
+        Каждый элемент проверяется отдельно; невалидные элементы попадают
+        в результат с ошибкой, остальные применяются.
+        """
+        results: List[TaskBatchItemResult] = []
+        translate_ids: List[int] = []
+
+        # Удаление первым освобождает интервалы для новых задач
+        deleted_ids = set(await self.task_repo.bulk_delete_tasks(user_id, delete))
+        for index, task_id in enumerate(delete):
+            results.append(TaskBatchItemResult(
+                operation="delete", index=index, id=task_id, ok=task_id in deleted_ids,
+                error=None if task_id in deleted_ids else "Task not found"
+            ))
+
+        update_rows = []
+        update_results = []
+        parsed_updates = []
+        for index, item in enumerate(update):
+            try:
+                parsed_updates.append((index, TaskBatchUpdate.model_validate(item)))
+            except ValidationError as e:
+                update_results.append(self._batch_error("update", index, e, item.get("id")))
+        intervals = await self.task_repo.get_task_intervals(
+            user_id, [data.id for _, data in parsed_updates]
+        )
+        stored = {
+            task_id: (as_utc(start_time), as_utc(end_time))
+            for task_id, (start_time, end_time) in intervals.items()
+        }
+        merged = dict(stored)
+        valid_updates = []
+        for index, data in parsed_updates:
+            if data.id not in merged:
+                update_results.append(TaskBatchItemResult(
+                    operation="update", index=index, id=data.id, ok=False, error="Task not found"
+                ))
+                continue
+            values = data.model_dump(exclude_unset=True)
+            # В БД интервал с часовым поясом, наивное время с ним не сравнить
+            for field in ("start_time", "end_time"):
+                if values.get(field) is not None:
+                    values[field] = as_utc(values[field])
+            # Строки UPDATE применяются по порядку: повторное изменение
+            # задачи накладывается на результат предыдущего
+            start_time, end_time = merged[data.id]
+            interval = (values.get("start_time", start_time), values.get("end_time", end_time))
+            try:
+                TimeInterval(start_time=interval[0], end_time=interval[1]).validate()
+            except ValueError as e:
+                update_results.append(self._batch_error("update", index, e, data.id))
+                continue
+            merged[data.id] = interval
+            valid_updates.append((index, data.id, values, interval))
+
+        # Нарушение unique_task_interval оборвало бы всю транзакцию, поэтому
+        # занятые интервалы проверяются заранее - в БД и внутри пакета
+        taken = await self.task_repo.get_tasks_by_intervals(
+            user_id, list({interval for _, _, _, interval in valid_updates})
+        )
+        occupied = {(as_utc(start_time), as_utc(end_time)): task_id for (start_time, end_time), task_id in taken.items()}
+        occupied.update({interval: task_id for task_id, interval in stored.items()})
+        for index, task_id, values, interval in valid_updates:
+            if occupied.get(interval, task_id) != task_id:
+                update_results.append(TaskBatchItemResult(
+                    operation="update", index=index, id=task_id, ok=False,
+                    error="Task with the same time interval already exists"
+                ))
+                continue
+            del occupied[stored[task_id]]
+            occupied[interval] = task_id
+            stored[task_id] = interval
+            update_rows.append(values)
+            update_results.append(TaskBatchItemResult(operation="update", index=index, id=task_id, ok=True))
+            if "title" in values or "description" in values:
+                translate_ids.append(task_id)
+        await self.task_repo.bulk_update_tasks(update_rows)
+        results.extend(sorted(update_results, key=lambda result: result.index))
+
+        create_rows = []
+        create_items = []
+        create_results: Dict[int, TaskBatchItemResult] = {}
+        for index, item in enumerate(create):
+            try:
+                data = TaskCreate.model_validate(item)
+                # RETURNING отдает время в UTC с поясом: приводим вход к тому же
+                # виду, иначе наивное время не совпадет с возвращенным
+                interval = (as_utc(data.start_time), as_utc(data.end_time))
+                TimeInterval(start_time=interval[0], end_time=interval[1]).validate()
+            except (ValidationError, ValueError) as e:
+                create_results[index] = self._batch_error("create", index, e)
+                continue
+            create_items.append((index, interval, data))
+            create_rows.append({
+                "user_id": user_id,
+                "title": data.title,
+                "description": data.description,
+                "start_time": interval[0],
+                "end_time": interval[1],
+            })
+        created = await self.task_repo.bulk_create_tasks(create_rows)
+
+        # RETURNING не гарантирует порядок - сопоставляем по интервалу
+        created_by_interval: Dict[tuple, List[int]] = {}
+        for row in created:
+            interval = (as_utc(row["start_time"]), as_utc(row["end_time"]))
+            created_by_interval.setdefault(interval, []).append(row["id"])
+        for index, interval, data in create_items:
+            ids = created_by_interval.get(interval)
+            if not ids:
+                create_results[index] = TaskBatchItemResult(
+                    operation="create", index=index, ok=False,
+                    error="Task with the same time interval already exists"
+                )
+                continue
+            task_id = ids.pop(0)
+            create_results[index] = TaskBatchItemResult(operation="create", index=index, id=task_id, ok=True)
+            if data.auto_translate:
+                translate_ids.append(task_id)
+        results.extend(create_results[index] for index in sorted(create_results))
+
+        # Переводы всего пакета ставятся одним INSERT в той же транзакции
+        await self.job_repo.enqueue_many(translate_ids, commit=False)
+        return results
+
+    @staticmethod
+    def _batch_error(operation: str, index: int, error: Exception, task_id: Optional[int] = None) -> TaskBatchItemResult:
+        if isinstance(error, ValidationError):
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+                for detail in error.errors()
+            )
+        else:
+            message = str(error)
+        return TaskBatchItemResult(operation=operation, index=index, id=task_id, ok=False, error=message)
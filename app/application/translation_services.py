@@ -1,25 +1,42 @@
 from app.Infrastructure.repository.task_repository import TaskRepository
-from app.Infrastructure.translation_client import TranslationClient
+from app.Infrastructure.translation_batcher import TranslationBatcher
+from app.Infrastructure.translation_cache import TranslationCache, translation_cache
+from app.core.config import settings
 from typing import Optional, Tuple
 from app.domain.models.task import Task
 
 class TranslationService:
-    def __init__(self, task_repo: TaskRepository, translation_client: TranslationClient):
+    def __init__(
+        self,
+        task_repo: TaskRepository,
+        translation_client: TranslationBatcher,
+        translation_cache: TranslationCache = translation_cache
+    ):
         self.task_repo = task_repo
         self.translation_client = translation_client
+        self.translation_cache = translation_cache
 
     async def translate_task(self, task: Task) -> Tuple[str, Optional[str]]:
-        # Переводим заголовок и описание
-        title_en = await self.translation_client.translate_text(task.title)
-        description_en = None
-        if task.description:
-            description_en = await self.translation_client.translate_text(task.description)
+        # Сначала кэш, недостающее - одной пачкой к провайдеру; в режиме по
+        # предложениям правка описания стоит только измененных предложений
+        if settings.TRANSLATION_SEGMENTED:
+            title_en, description_en = await self.translation_cache.get_or_translate_segmented(
+                [task.title, task.description],
+                self.translation_client,
+                max_segment_chars=settings.TRANSLATION_SEGMENT_MAX_CHARS
+            )
+        else:
+            title_en, description_en = await self.translation_cache.get_or_translate(
+                [task.title, task.description],
+                self.translation_client
+            )
         
         # Сохраняем переводы в БД
         await self.task_repo.update_translation(
             task_id=task.id,
-            title_en=title_en,
-            description_en=description_en
+            language="en",
+            title=title_en,
+            description=description_en
         )
         
         return title_en, description_en
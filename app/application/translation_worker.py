@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.Infrastructure.database import AsyncSessionLocal
+from app.Infrastructure.metrics import TRANSLATION_JOBS, TRANSLATION_QUEUE_JOBS, TRANSLATION_QUEUE_LAG
+from app.Infrastructure.repository.task_repository import TaskRepository
+from app.Infrastructure.repository.translation_job_repository import TranslationJobRepository
+from app.Infrastructure.translation_client import get_translation_batcher
+from app.application.translation_services import TranslationService
+from app.domain.models.translation_job import TranslationJob
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationWorkerPool:
+    """Пул asyncio-воркеров, выполняющих задания из таблицы translation_jobs.
+
+    Может работать внутри API-процесса (из lifespan) или отдельно
+    через `python -m app.worker`. Раз в metrics_interval секунд пул
+    обновляет метрики очереди: число заданий по статусам и задержку.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.TRANSLATION_WORKER_CONCURRENCY,
+        poll_interval: float = settings.TRANSLATION_WORKER_POLL_INTERVAL,
+        max_attempts: int = settings.TRANSLATION_JOB_MAX_ATTEMPTS,
+        backoff_base: float = settings.TRANSLATION_JOB_BACKOFF_BASE,
+        backoff_max: float = settings.TRANSLATION_JOB_BACKOFF_MAX,
+        visibility_timeout: float = settings.TRANSLATION_JOB_VISIBILITY_TIMEOUT,
+        metrics_interval: float = settings.TRANSLATION_QUEUE_METRICS_INTERVAL
+    ):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.visibility_timeout = visibility_timeout
+        self.metrics_interval = metrics_interval
+        self._workers: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+        self.processed = 0
+        self.failed = 0
+        self.dead = 0
+
+    def start(self) -> None:
+        self._stopping.clear()
+        for number in range(self.concurrency):
+            self._workers.append(
+                asyncio.create_task(self._run(), name=f"translation-worker-{number}")
+            )
+        self._workers.append(asyncio.create_task(self._report_queue(), name="translation-queue-metrics"))
+        logger.info(f"Started {self.concurrency} translation workers")
+
+    async def stop(self) -> None:
+        """Дает воркерам доделать текущие задания и останавливает их"""
+        self._stopping.set()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers.clear()
+        logger.info("Translation workers stopped")
+
+    async def get_stats(self) -> dict:
+        async with AsyncSessionLocal() as session:
+            stats = await TranslationJobRepository(session).get_stats()
+        stats.update(processed=self.processed, failed=self.failed, dead_lettered=self.dead)
+        return stats
+
+    async def refresh_metrics(self) -> dict:
+        stats = await self.get_stats()
+        for status in (TranslationJob.STATUS_PENDING, TranslationJob.STATUS_RUNNING, TranslationJob.STATUS_DEAD):
+            TRANSLATION_QUEUE_JOBS.labels(status).set(stats[status])
+        TRANSLATION_QUEUE_LAG.set(stats["lag_seconds"])
+        return stats
+
+    def backoff_delay(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base ** attempts)
+        # Джиттер, чтобы упавшие разом задания не вернулись тоже разом
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"Error claiming translation job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job)
+
+    async def _report_queue(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.refresh_metrics()
+            except Exception as e:
+                logger.error(f"Error collecting translation queue stats: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.metrics_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> Optional[TranslationJob]:
+        async with AsyncSessionLocal() as session:
+            jobs = await TranslationJobRepository(session).claim(1, self.visibility_timeout)
+            return jobs[0] if jobs else None
+
+    async def _process(self, job: TranslationJob) -> None:
+        async with AsyncSessionLocal() as session:
+            job_repo = TranslationJobRepository(session)
+
+            if job.attempts > self.max_attempts:
+                # Задание раз за разом роняло воркер
+                self.dead += 1
+                TRANSLATION_JOBS.labels("dead").inc()
+                await job_repo.fail(job.id, job.last_error or "Worker lost the job", None)
+                return
+
+            task_repo = TaskRepository(session)
+            try:
+                translation_service = TranslationService(task_repo, get_translation_batcher())
+                await translation_service.translate_and_save_task(job.task_id)
+            except Exception as e:
+                await session.rollback()
+                if isinstance(e, IntegrityError) and not await task_repo.task_exists(job.task_id):
+                    # Задачу удалили, пока шёл перевод; задание удалено вместе с ней
+                    logger.info(f"Translation job {job.id} dropped: task {job.task_id} was deleted")
+                    TRANSLATION_JOBS.labels("dropped").inc()
+                    return
+                self.failed += 1
+                TRANSLATION_JOBS.labels("failed").inc()
+                error = str(e) or e.__class__.__name__
+                if job.attempts >= self.max_attempts:
+                    self.dead += 1
+                    TRANSLATION_JOBS.labels("dead").inc()
+                    logger.error(f"Translation job {job.id} for task {job.task_id} moved to dead-letter: {error}")
+                    await job_repo.fail(job.id, error, None)
+                else:
+                    retry_at = datetime.utcnow() + timedelta(seconds=self.backoff_delay(job.attempts))
+                    logger.warning(f"Translation job {job.id} for task {job.task_id} failed, retry at {retry_at}: {error}")
+                    await job_repo.fail(job.id, error, retry_at)
+                return
+
+            self.processed += 1
+            TRANSLATION_JOBS.labels("processed").inc()
+            await job_repo.complete(job.id)
@@ -0,0 +1,7 @@
+import logging
+from app.core.config import settings
+
+
+def setup_logging() -> None:
+    """Настройка логирования; вызывается точками входа, а не при импорте модулей"""
+    logging.basicConfig(level=settings.LOG_LEVEL)
@@ -1,5 +1,8 @@
 from app.domain.models.user import User
 from app.domain.models.task import Task
 from app.domain.models.translation import TaskTranslation
+from app.domain.models.translation_cache import TranslationCacheEntry
+from app.domain.models.translation_job import TranslationJob
+from app.domain.models.task_import import TaskImport
 
-__all__ = ["User", "Task", "TaskTranslation"]
+__all__ = ["User", "Task", "TaskTranslation", "TranslationCacheEntry", "TranslationJob", "TaskImport"]
@@ -1,9 +1,35 @@
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, DateTime, FetchedValue, ForeignKey, Index, Table, event, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.Infrastructure.database import Base
 
+# Исходный текст задач на русском
+TASK_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+
+def search_vector_trigger(table: Table, expression: str, columns: str) -> None:
+    """Вешает на create_all тот же триггер search_vector, что ставит миграция 0150168a16d5.
+
+    Вектор поддерживает триггер, а не STORED generated column: добавление
+    такого столбца переписывает всю таблицу под ACCESS EXCLUSIVE.
+    """
+    name = f"{table.name}_search_vector_update"
+    event.listen(table, "after_create", DDL(
+        f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$ BEGIN "
+        f"SELECT {expression} INTO NEW.search_vector FROM (SELECT NEW.*) AS t; "
+        "RETURN NEW; END $$ LANGUAGE plpgsql"
+    ))
+    event.listen(table, "after_create", DDL(
+        f"CREATE TRIGGER {name} BEFORE INSERT OR UPDATE OF {columns} ON {table.name} "
+        f"FOR EACH ROW EXECUTE FUNCTION {name}()"
+    ))
+
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -11,20 +37,38 @@ class Task(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     title: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[Optional[str]] = mapped_column(nullable=True)
-    start_time: Mapped[datetime] = mapped_column(nullable=False)
-    end_time: Mapped[datetime] = mapped_column(nullable=False)
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow, 
         onupdate=datetime.utcnow
     )
 
+    # Заполняет триггер (см. search_vector_trigger)
+    search_vector = mapped_column(
+        TSVECTOR, server_default=FetchedValue(), server_onupdate=FetchedValue(), deferred=True
+    )
+
     translations: Mapped[List["TaskTranslation"]] = relationship(
         back_populates="task", 
         cascade="all, delete-orphan"
     )
     user: Mapped["User"] = relationship(back_populates="tasks")
 
+    __table_args__ = (
+        # Keyset-пагинация списка задач пользователя
+        Index("ix_tasks_user_start_id", "user_id", "start_time", "id"),
+        # Поиск пересечений интервалов (нужно расширение btree_gist)
+        Index(
+            "ix_tasks_user_period",
+            "user_id",
+            func.tstzrange(text("start_time"), text("end_time"), text("'[)'")),
+            postgresql_using="gist"
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     def with_translation(self, language: str) -> dict:
         """Возвращает задачу с переводом на указанный язык"""
         translation = next(
@@ -45,3 +89,6 @@ class Task(Base):
 
     class Config:
         from_attributes = True
+
+
+search_vector_trigger(Task.__table__, TASK_SEARCH_VECTOR_SQL, "title, description")
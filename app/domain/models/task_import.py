@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.Infrastructure.database import Base
+
+class TaskImport(Base):
+    __tablename__ = "task_imports"
+
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    status: Mapped[str] = mapped_column(default=STATUS_RUNNING, nullable=False)
+    # Чекпоинт: столько строк источника уже обработано и зафиксировано
+    rows_processed: Mapped[int] = mapped_column(default=0, nullable=False)
+    rows_imported: Mapped[int] = mapped_column(default=0, nullable=False)
+    rows_skipped: Mapped[int] = mapped_column(default=0, nullable=False)
+    rows_failed: Mapped[int] = mapped_column(default=0, nullable=False)
+    errors: Mapped[List[dict]] = mapped_column(JSONB, default=list, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, 
+        onupdate=datetime.utcnow
+    )
+
+    class Config:
+        from_attributes = True
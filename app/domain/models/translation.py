@@ -1,8 +1,36 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import ForeignKey
+from sqlalchemy import FetchedValue, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.Infrastructure.database import Base
+from app.domain.models.task import search_vector_trigger
+
+# Конфигурации полнотекстового поиска по коду языка перевода
+SEARCH_CONFIGS = {
+    "ru": "russian",
+    "en": "english",
+    "de": "german",
+    "fr": "french",
+    "es": "spanish",
+    "it": "italian",
+}
+
+
+def search_config(language: str) -> str:
+    return SEARCH_CONFIGS.get(language, "simple")
+
+
+_CONFIG_CASE_SQL = (
+    "CASE language "
+    + " ".join(f"WHEN '{code}' THEN '{config}'::regconfig" for code, config in SEARCH_CONFIGS.items())
+    + " ELSE 'simple'::regconfig END"
+)
+
+TRANSLATION_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector({_CONFIG_CASE_SQL}, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector({_CONFIG_CASE_SQL}, coalesce(description, '')), 'B')"
+)
 
 class TaskTranslation(Base):
     __tablename__ = "task_translations"
@@ -18,7 +46,21 @@ class TaskTranslation(Base):
         onupdate=datetime.utcnow
     )
 
+    # Заполняет триггер (см. search_vector_trigger)
+    search_vector = mapped_column(
+        TSVECTOR, server_default=FetchedValue(), server_onupdate=FetchedValue(), deferred=True
+    )
+
     task: Mapped["Task"] = relationship(back_populates="translations")
 
+    __table_args__ = (
+        # Один перевод на язык; по нему же идет JOIN при чтении задач
+        Index("ix_task_translations_task_language", "task_id", "language", unique=True),
+        Index("ix_task_translations_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     class Config:
         from_attributes = True
+
+
+search_vector_trigger(TaskTranslation.__table__, TRANSLATION_SEARCH_VECTOR_SQL, "language, title, description")
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.Infrastructure.database import Base
+
+class TranslationCacheEntry(Base):
+    __tablename__ = "translation_cache"
+
+    # sha256 от (source_lang, target_lang, нормализованный текст)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    source_lang: Mapped[str] = mapped_column(nullable=False)
+    target_lang: Mapped[str] = mapped_column(nullable=False)
+    translated_text: Mapped[str] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+    class Config:
+        from_attributes = True
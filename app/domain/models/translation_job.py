@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import ForeignKey, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.Infrastructure.database import Base
+
+class TranslationJob(Base):
+    __tablename__ = "translation_jobs"
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DEAD = "dead"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
+    status: Mapped[str] = mapped_column(default=STATUS_PENDING, nullable=False)
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    run_after: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, 
+        onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        # Не больше одного ожидающего задания на задачу
+        Index(
+            "uq_translation_jobs_pending_task",
+            "task_id",
+            unique=True,
+            postgresql_where=text("status = 'pending'")
+        ),
+        Index("ix_translation_jobs_status_run_after", "status", "run_after"),
+    )
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Literal, Dict, Any
 
 
 class TaskBase(BaseModel):
@@ -47,6 +47,67 @@ class TaskResponse(TaskBase):
         from_attributes = True
 
 
+class TaskPage(BaseModel):
+    items: List[TaskResponse] = []
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, null on the last page")
+
+    class Config:
+        from_attributes = True
+
+
+class TaskSearchHit(TaskResponse):
+    rank: float
+    title_highlight: Optional[str] = None
+    description_highlight: Optional[str] = None
+
+
+class TaskSearchPage(BaseModel):
+    items: List[TaskSearchHit] = []
+    next_cursor: Optional[str] = None
+
+
+class TaskBatchUpdate(TaskUpdate):
+    id: int = Field(..., gt=0)
+
+
+class TaskBatchRequest(BaseModel):
+    # Элементы проверяются по одному в сервисе, чтобы ошибка в одном
+    # не отклоняла весь пакет
+    create: List[Dict[str, Any]] = []
+    update: List[Dict[str, Any]] = []
+    delete: List[int] = []
+
+
+class TaskBatchItemResult(BaseModel):
+    operation: Literal["create", "update", "delete"]
+    index: int
+    id: Optional[int] = None
+    ok: bool
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchItemResult] = []
+
+
+class TaskImportError(BaseModel):
+    row: int
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    id: int
+    status: str
+    rows_processed: int
+    rows_imported: int
+    rows_skipped: int
+    rows_failed: int
+    errors: List[TaskImportError] = []
+
+    class Config:
+        from_attributes = True
+
+
 class TaskDelete(BaseModel):
     task_id: int = Field(..., gt=0)
 
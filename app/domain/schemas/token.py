@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import datetime
 
 class Token(BaseModel):
     access_token: str
@@ -6,4 +7,5 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 class TokenData(BaseModel):
-    username: str | None = None 
\ No newline at end of file
+    username: str | None = None
+    exp: datetime | None = None 
\ No newline at end of file
@@ -1,6 +1,23 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict, WithJsonSchema
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
+
+
+def validate_email_address(value: str) -> str:
+    # email_validator тянет dnspython; EmailStr импортирует его при объявлении
+    # схемы, а здесь - только при первой проверке адреса
+    from email_validator import EmailNotValidError, validate_email
+    try:
+        return validate_email(value, check_deliverability=False).normalized
+    except EmailNotValidError as e:
+        raise ValueError(f"value is not a valid email address: {e}")
+
+
+EmailStr = Annotated[
+    str,
+    AfterValidator(validate_email_address),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
 
 class UserBase(BaseModel):
     username: str = Field(..., min_length=3, max_length=50, pattern="^[a-zA-Z0-9_-]+$")
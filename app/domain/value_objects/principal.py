@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class Principal(BaseModel):
+    """Неизменяемый снимок аутентифицированного пользователя.
+
+    В кэше принципалов и в эндпоинтах живёт он, а не ORM-объект User:
+    тот привязан к сессии запроса и меняется при её коммите/refresh.
+    """
+    id: int
+    username: str
+    email: str
+    is_active: bool
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
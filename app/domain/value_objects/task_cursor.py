@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+from pydantic import BaseModel
+
+
+def _encode(payload: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+class TaskCursor(BaseModel):
+    """Непрозрачный курсор keyset-пагинации по (start_time, id)"""
+    start_time: datetime
+    id: int
+
+    def encode(self) -> str:
+        return _encode({"s": self.start_time.isoformat(), "i": self.id})
+
+    @classmethod
+    def decode(cls, cursor: str) -> "TaskCursor":
+        try:
+            payload = _decode(cursor)
+            return cls(start_time=payload["s"], id=payload["i"])
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+
+class TaskSearchCursor(BaseModel):
+    """Курсор результатов поиска по (rank desc, id)"""
+    rank: float
+    id: int
+
+    def encode(self) -> str:
+        return _encode({"r": self.rank, "i": self.id})
+
+    @classmethod
+    def decode(cls, cursor: str) -> "TaskSearchCursor":
+        try:
+            payload = _decode(cursor)
+            return cls(rank=payload["r"], id=payload["i"])
+        except Exception:
+            raise ValueError("Invalid cursor")
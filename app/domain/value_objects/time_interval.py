@@ -1,10 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from pydantic import BaseModel
 
+
+def as_utc(value: datetime) -> datetime:
+    """Время в UTC с часовым поясом; наивное считается UTC, как и в asyncpg"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 class TimeInterval(BaseModel):
     start_time: datetime
     end_time: datetime
 
     def validate(self):
         if self.start_time >= self.end_time:
-            raise ValueError("start_time must be earlier than end_time")
\ No newline at end of file
+            raise ValueError("start_time must be earlier than end_time")
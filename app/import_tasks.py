@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import json
+from app.application.import_services import TaskImportService
+from app.domain.schemas.task import TaskImportResponse
+from app.Infrastructure.database import AsyncSessionLocal, close_db
+from app.core.logging_config import setup_logging
+from app.Infrastructure.repository.task_import_repository import TaskImportRepository
+from app.Infrastructure.repository.translation_job_repository import TranslationJobRepository
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_file(path: str):
+    with open(path, "rb") as source:
+        while chunk := source.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def main():
+    """Импорт задач из файла: python -m app.import_tasks --user-id 1 tasks.csv"""
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Bulk import tasks via PostgreSQL COPY")
+    parser.add_argument("path")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument("--import-id", type=int, help="Resume an interrupted import")
+    parser.add_argument("--translate", action="store_true", help="Enqueue translations for imported tasks")
+    args = parser.parse_args()
+    source_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+
+    try:
+        async with AsyncSessionLocal() as session:
+            import_service = TaskImportService(TaskImportRepository(session), TranslationJobRepository(session))
+            task_import = await import_service.start(args.user_id, args.import_id)
+            if task_import is None:
+                raise SystemExit(f"Import {args.import_id} not found for user {args.user_id}")
+            await import_service.run(task_import, read_file(args.path), source_format, args.translate)
+            print(json.dumps(TaskImportResponse.model_validate(task_import).model_dump(), indent=2))
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,20 +1,45 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.api.endpoints.auth import auth_router
 from app.api.endpoints.tasks import tasks_router
+from app.api.middleware import AdmissionControlMiddleware, MetricsMiddleware, QueryTrackingMiddleware
+from app.Infrastructure.metrics import render_metrics, mark_process_dead
 from app.core.config import settings
+from app.core.logging_config import setup_logging
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Инициализация при запуске
+    # Инициализация при запуске; httpx не импортируется вместе с app.main
     from app.Infrastructure.database import init_db
+    from app.Infrastructure.principal_cache import create_invalidation_listener
+    setup_logging()
     await init_db()
+    invalidation_listener = create_invalidation_listener()
+    if invalidation_listener is not None:
+        invalidation_listener.start()
+    worker_pool = None
+    if settings.TRANSLATION_WORKER_IN_PROCESS:
+        from app.Infrastructure.translation_client import init_translation_client
+        from app.application.translation_worker import TranslationWorkerPool
+        # Клиент создается до первого задания, а не в нем
+        await init_translation_client()
+        worker_pool = TranslationWorkerPool()
+        worker_pool.start()
     yield
     # Очистка при выключении
     from app.Infrastructure.database import close_db
+    from app.Infrastructure.translation_client import close_translation_client
+    if worker_pool is not None:
+        await worker_pool.stop()
+    if invalidation_listener is not None:
+        await invalidation_listener.stop()
+    await close_translation_client()
     await close_db()
+    from app.Infrastructure.password_hasher import password_hasher
+    password_hasher.shutdown()
+    mark_process_dead()
 
 
 app = FastAPI(
@@ -33,6 +58,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(QueryTrackingMiddleware)
+# Снаружи остаются только метрики, чтобы отказы тоже попадали в статистику
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Подключение роутеров
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(tasks_router, prefix="/api/v1/tasks", tags=["Tasks"])
@@ -45,4 +77,11 @@ async def root():
         "version": settings.PROJECT_VERSION,
         "docs_url": "/docs",
         "redoc_url": "/redoc"
-    }        
\ No newline at end of file
+    }
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
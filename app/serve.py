@@ -0,0 +1,73 @@
+import importlib.util
+import logging
+import os
+import shutil
+import tempfile
+import uvicorn
+from app.core.config import settings
+from app.core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS:
+        return settings.SERVER_WORKERS
+    # sched_getaffinity учитывает ограничение CPU в контейнере
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    """Общий каталог метрик для всех воркеров, очищенный от прошлого запуска"""
+    if workers <= 1 or not settings.METRICS_ENABLED:
+        return
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        path = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def main():
+    """Production-запуск API: python -m app.serve
+
+    uvicorn-супервизор держит SERVER_WORKERS процессов и перезапускает
+    упавшие. SIGTERM/SIGINT - перестать принимать соединения, дождаться
+    текущих запросов (до SERVER_GRACEFUL_TIMEOUT) и выполнить lifespan
+    shutdown. SIGHUP - поочередный перезапуск воркеров без остановки
+    сервиса, SIGTTIN/SIGTTOU - добавить/убрать воркер.
+    """
+    setup_logging()
+    workers = worker_count()
+    # Воркеры стартуют через spawn и читают настройки заново: пул БД
+    # каждого из них считается от этого числа (см. pool_sizing)
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    settings.WEB_CONCURRENCY = workers
+    prepare_metrics_dir(workers)
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(f"Starting {workers} workers on {settings.SERVER_HOST}:{settings.SERVER_PORT} (loop={loop}, http={http})")
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        access_log=settings.SERVER_ACCESS_LOG,
+        log_level=settings.LOG_LEVEL.lower(),
+        proxy_headers=True,
+        server_header=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
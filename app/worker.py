@@ -0,0 +1,32 @@
+import asyncio
+import logging
+import signal
+from app.application.translation_worker import TranslationWorkerPool
+from app.Infrastructure.database import close_db
+from app.Infrastructure.translation_client import init_translation_client, close_translation_client
+from app.core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Отдельный процесс воркеров перевода: python -m app.worker"""
+    setup_logging()
+    await init_translation_client()
+    pool = TranslationWorkerPool()
+    pool.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await stop.wait()
+    logger.info("Shutting down translation workers...")
+    await pool.stop()
+    await close_translation_client()
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""Заглушка API перевода (формат Google Translate v2) для нагрузочных тестов.
+
+Отвечает "[en] <текст>" с заданной задержкой и долей ошибок 503.
+
+    python -m benchmarks.fake_translation_server --port 9100 --latency-ms 50 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+from fastapi import FastAPI, HTTPException, Request
+
+
+def create_app(latency_ms: float, jitter_ms: float, error_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.characters = 0
+
+    @app.post("/translate")
+    async def translate(request: Request):
+        payload = await request.json()
+        texts = payload["q"] if isinstance(payload["q"], list) else [payload["q"]]
+        app.state.calls += 1
+        app.state.characters += sum(len(text) for text in texts)
+
+        delay = max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if random.random() < error_rate:
+            raise HTTPException(status_code=503, detail="Injected failure")
+
+        target = payload.get("target", "en")
+        return {
+            "data": {
+                "translations": [{"translatedText": f"[{target}] {text}"} for text in texts]
+            }
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"calls": app.state.calls, "characters": app.state.characters}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter_ms, args.error_rate),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Бенчмарк перевода при правках: весь текст против перевода по предложениям.
+
+Для каждой задачи описание переводится, затем --edits раз в нем меняется
+несколько слов одного предложения и перевод повторяется. Провайдер -
+заглушка, считающая символы и имитирующая задержку от объема текста.
+
+    python -m benchmarks.incremental_translation --tasks 200 --edits 5
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from app.Infrastructure.translation_cache import TranslationCache
+
+SENTENCES = [
+    "Обсудить с командой план релиза на следующую неделю.",
+    "Подготовить отчет о нагрузке на базу данных за прошлый месяц.",
+    "Проверить, что миграции применяются без простоя.",
+    "Согласовать с дизайнерами новые макеты страницы задач.",
+    "Написать письмо партнерам о переносе сроков интеграции.",
+    "Разобрать входящие обращения пользователей и завести задачи.",
+    "Обновить документацию по развертыванию в новом кластере.",
+    "Назначить ответственных за дежурства на праздники.",
+]
+
+
+class CountingTranslator:
+    def __init__(self, ms_per_request: float, ms_per_kchar: float):
+        self.ms_per_request = ms_per_request
+        self.ms_per_kchar = ms_per_kchar
+        self.requests = 0
+        self.characters = 0
+
+    async def translate_many(self, texts, target_lang="en", source_lang="ru"):
+        chars = sum(len(text) for text in texts)
+        self.requests += 1
+        self.characters += chars
+        await asyncio.sleep((self.ms_per_request + self.ms_per_kchar * chars / 1000) / 1000)
+        return [f"[{target_lang}] {text}" for text in texts]
+
+
+def make_description(rng: random.Random) -> str:
+    return " ".join(rng.sample(SENTENCES, k=len(SENTENCES)))[:1000]
+
+
+def edit_description(rng: random.Random, description: str, revision: int) -> str:
+    sentences = description.split(". ")
+    index = rng.randrange(len(sentences))
+    sentences[index] = f"{sentences[index]} (правка {revision})"
+    return ". ".join(sentences)
+
+
+async def run_mode(mode: str, tasks: int, edits: int, seed: int, args) -> dict:
+    rng = random.Random(seed)
+    cache = TranslationCache(max_size=100000, persistent=False)
+    translator = CountingTranslator(args.ms_per_request, args.ms_per_kchar)
+    translate = cache.get_or_translate_segmented if mode == "segmented" else cache.get_or_translate
+
+    started = time.perf_counter()
+    for task_number in range(tasks):
+        description = make_description(rng)
+        title = f"Задача {task_number}"
+        await translate([title, description], translator)
+        for revision in range(edits):
+            description = edit_description(rng, description, revision)
+            await translate([title, description], translator)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "translations": tasks * (edits + 1),
+        "provider_requests": translator.requests,
+        "characters_sent": translator.characters,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ms-per-request", type=float, default=2.0)
+    parser.add_argument("--ms-per-kchar", type=float, default=5.0)
+    args = parser.parse_args()
+
+    whole = await run_mode("whole", args.tasks, args.edits, args.seed, args)
+    segmented = await run_mode("segmented", args.tasks, args.edits, args.seed, args)
+    print(json.dumps({
+        "results": [whole, segmented],
+        "characters_ratio": round(segmented["characters_sent"] / whole["characters_sent"], 3),
+        "latency_ratio": round(segmented["elapsed_s"] / whole["elapsed_s"], 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
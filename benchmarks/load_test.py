@@ -0,0 +1,429 @@
+"""Нагрузочный тест API: смешанный сценарий с фиксированной конкурентностью.
+
+run     - поднимает Postgres (без --database-url - временный кластер через
+          initdb/pg_ctl; нужно расширение btree_gist), применяет миграции,
+          запускает заглушку API перевода и приложение под uvicorn, после
+          чего --concurrency виртуальных пользователей регистрируются,
+          логинятся и гоняют смесь create (auto_translate) / list ru / list en /
+          patch / delete. Отчет - p50/p95/p99 и RPS по эндпоинтам в JSON.
+          С --base-url нагружает уже запущенное приложение.
+compare - сравнивает два отчета и завершается с кодом 1 при регрессии.
+
+    python -m benchmarks.load_test run --concurrency 32 --duration 60 --output base.json
+    python -m benchmarks.load_test compare base.json new.json --threshold 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import httpx
+
+AUTH_PREFIX = "/api/v1/auth/auth"
+TASKS_PREFIX = "/api/v1/tasks/tasks"
+DEFAULT_MIX = "create=20,list_ru=30,list_en=25,patch=15,delete=10"
+PASSWORD = "benchmark-password"
+# Регистрация и логин - по разу на пользователя, их замеряем и во время прогрева
+ONE_SHOT_OPERATIONS = ("register", "login")
+# Нужны миграциям: GiST-индекс по (user_id, tstzrange) использует btree_gist
+REQUIRED_EXTENSIONS = ["btree_gist"]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_http(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit(f"{url} did not come up in {timeout}s")
+        time.sleep(0.2)
+
+
+@contextmanager
+def ephemeral_postgres(max_connections: int):
+    """Временный кластер Postgres в каталоге /tmp, без контейнеров"""
+    missing = [tool for tool in ("initdb", "pg_ctl") if shutil.which(tool) is None]
+    if missing:
+        raise SystemExit(f"{', '.join(missing)} not found in PATH; pass --database-url instead")
+
+    data_dir = tempfile.mkdtemp(prefix="bench-pg-")
+    port = free_port()
+    subprocess.run(
+        ["initdb", "-D", data_dir, "-U", "postgres", "--auth=trust", "-E", "UTF8"],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    subprocess.run(
+        [
+            "pg_ctl", "-D", data_dir, "-l", os.path.join(data_dir, "server.log"), "-w",
+            "-o", f"-p {port} -k {data_dir} -c max_connections={max_connections}",
+            "start",
+        ],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    try:
+        yield f"postgresql+asyncpg://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run(["pg_ctl", "-D", data_dir, "-m", "fast", "stop"], stdout=subprocess.DEVNULL)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+async def missing_extensions(database_url: str) -> List[str]:
+    import asyncpg
+
+    connection = await asyncpg.connect(database_url.replace("postgresql+asyncpg://", "postgresql://", 1))
+    try:
+        rows = await connection.fetch(
+            "SELECT name FROM pg_available_extensions WHERE name = ANY($1::text[])", REQUIRED_EXTENSIONS
+        )
+    finally:
+        await connection.close()
+    return sorted(set(REQUIRED_EXTENSIONS) - {row["name"] for row in rows})
+
+
+def migrate(database_url: str) -> None:
+    """Приводит БД к head миграций: приложение стартует в режиме DB_SCHEMA_MODE=check"""
+    missing = asyncio.run(missing_extensions(database_url))
+    if missing:
+        raise SystemExit(
+            f"PostgreSQL extensions {', '.join(missing)} are not available; "
+            f"install the contrib package for this server"
+        )
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=PROJECT_ROOT, env=dict(os.environ, DATABASE_URL=database_url),
+        check=True, stdout=subprocess.DEVNULL
+    )
+
+
+@contextmanager
+def background_process(command: List[str], env: Optional[dict] = None):
+    process = subprocess.Popen(command, env=env)
+    try:
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, weight = part.split("=")
+        weights[name.strip()] = float(weight)
+    unknown = set(weights) - {"create", "list_ru", "list_en", "patch", "delete"}
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+class Recorder:
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    async def call(self, name: str, request) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError as e:
+            response = None
+            status = e.__class__.__name__
+        else:
+            status = str(response.status_code)
+
+        if started >= self.measure_from or name in ONE_SHOT_OPERATIONS:
+            self.latencies.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+            statuses = self.statuses.setdefault(name, {})
+            statuses[status] = statuses.get(status, 0) + 1
+            if response is None or response.status_code >= 400:
+                self.errors[name] = self.errors.get(name, 0) + 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            errors = self.errors.get(name, 0)
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": errors,
+                "error_rate": round(errors / len(values), 4),
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "mean_ms": round(sum(values) / len(values), 2),
+                "max_ms": round(max(values), 2),
+                "statuses": self.statuses[name],
+            }
+        everything = [value for values in self.latencies.values() for value in values]
+        errors = sum(self.errors.values())
+        total = {
+            "requests": len(everything),
+            "errors": errors,
+            "error_rate": round(errors / len(everything), 4) if everything else 0.0,
+            "rps": round(len(everything) / elapsed, 2),
+            "p50_ms": round(percentile(everything, 50), 2),
+            "p95_ms": round(percentile(everything, 95), 2),
+            "p99_ms": round(percentile(everything, 99), 2),
+        }
+        return {"endpoints": endpoints, "total": total}
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    username: str,
+    deadline: float,
+    recorder: Recorder,
+    mix: Dict[str, float],
+    rng: random.Random
+) -> None:
+    await recorder.call("register", client.post(
+        f"{AUTH_PREFIX}/register",
+        json={"username": username, "email": f"{username}@example.com", "password": PASSWORD}
+    ))
+    response = await recorder.call("login", client.post(
+        f"{AUTH_PREFIX}/login", data={"username": username, "password": PASSWORD}
+    ))
+    if response is None or response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    operations = list(mix)
+    weights = [mix[operation] for operation in operations]
+    task_ids: List[int] = []
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    counter = 0
+
+    while time.perf_counter() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        if operation in ("patch", "delete") and not task_ids:
+            operation = "create"
+
+        if operation == "create":
+            counter += 1
+            begins = start + timedelta(hours=counter)
+            response = await recorder.call("create", client.post(TASKS_PREFIX, headers=headers, json={
+                "title": f"Встреча с командой {counter}",
+                "description": "Обсуждение планов на неделю и распределение задач",
+                "start_time": begins.isoformat(),
+                "end_time": (begins + timedelta(minutes=30)).isoformat(),
+                "auto_translate": True,
+            }))
+            if response is not None and response.status_code == 201:
+                task_ids.append(response.json()["id"])
+        elif operation in ("list_ru", "list_en"):
+            await recorder.call(operation, client.get(
+                TASKS_PREFIX, headers=headers, params={"language": operation[-2:], "limit": 50}
+            ))
+        elif operation == "patch":
+            task_id = rng.choice(task_ids)
+            await recorder.call("patch", client.patch(
+                f"{TASKS_PREFIX}/{task_id}", headers=headers,
+                json={"description": f"Обновлено {rng.randint(0, 10 ** 6)}"}
+            ))
+        else:
+            task_id = task_ids.pop(rng.randrange(len(task_ids)))
+            await recorder.call("delete", client.delete(f"{TASKS_PREFIX}/{task_id}", headers=headers))
+
+
+async def drive(base_url: str, args) -> dict:
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    run_id = f"{int(time.time())}{rng.randrange(10 ** 4):04d}"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        started = time.perf_counter()
+        recorder = Recorder(measure_from=started + args.warmup)
+        deadline = started + args.warmup + args.duration
+        await asyncio.gather(*(
+            virtual_user(
+                client, f"bench_{run_id}_{number}", deadline, recorder, mix,
+                random.Random(args.seed * 1000 + number)
+            )
+            for number in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - recorder.measure_from
+
+    report = recorder.report(elapsed)
+    report["config"] = {
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "mix": mix,
+        "seed": args.seed,
+        "app_workers": args.workers,
+        "translation_latency_ms": args.translation_latency_ms,
+        "translation_error_rate": args.translation_error_rate,
+    }
+    report["environment"] = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+    }
+    return report
+
+
+def run(args) -> None:
+    with ExitStack() as stack:
+        base_url = args.base_url
+        fake_stats_url = None
+        if base_url is None:
+            database_url = args.database_url or stack.enter_context(
+                ephemeral_postgres(max_connections=args.pg_max_connections)
+            )
+            migrate(database_url)
+
+            translation_port = free_port()
+            stack.enter_context(background_process([
+                sys.executable, "-m", "benchmarks.fake_translation_server",
+                "--port", str(translation_port),
+                "--latency-ms", str(args.translation_latency_ms),
+                "--error-rate", str(args.translation_error_rate),
+            ]))
+            fake_stats_url = f"http://127.0.0.1:{translation_port}/stats"
+            wait_http(fake_stats_url, timeout=30)
+
+            app_port = free_port()
+            env = dict(
+                os.environ,
+                DATABASE_URL=database_url,
+                TRANSLATION_API_URL=f"http://127.0.0.1:{translation_port}/translate",
+                WEB_CONCURRENCY=str(args.workers),
+                DB_SCHEMA_MODE="check",
+                DEBUG="false",
+            )
+            stack.enter_context(background_process([
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(app_port),
+                "--workers", str(args.workers), "--log-level", "warning",
+            ], env=env))
+            base_url = f"http://127.0.0.1:{app_port}"
+            wait_http(f"{base_url}/", timeout=60)
+
+        report = asyncio.run(drive(base_url, args))
+        if fake_stats_url is not None:
+            report["translation_stub"] = httpx.get(fake_stats_url).json()
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as target:
+            target.write(output)
+    print(output)
+
+
+def relative_change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def compare(args) -> None:
+    with open(args.base, encoding="utf-8") as source:
+        base = json.load(source)
+    with open(args.new, encoding="utf-8") as source:
+        new = json.load(source)
+
+    changes = {}
+    regressions = []
+    for name in sorted(set(base["endpoints"]) & set(new["endpoints"])):
+        before, after = base["endpoints"][name], new["endpoints"][name]
+        change = {
+            metric: round(relative_change(before[metric], after[metric]), 4)
+            for metric in ("p50_ms", "p95_ms", "p99_ms", "rps")
+        }
+        change["error_rate"] = round(after["error_rate"] - before["error_rate"], 4)
+        changes[name] = change
+
+        if change["p95_ms"] > args.threshold:
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {after['p95_ms']} ms")
+        if change["rps"] < -args.threshold:
+            regressions.append(f"{name}: throughput {before['rps']} -> {after['rps']} rps")
+        if change["error_rate"] > args.error_threshold:
+            regressions.append(f"{name}: error rate {before['error_rate']} -> {after['error_rate']}")
+
+    print(json.dumps({
+        "base": base.get("environment", {}).get("revision"),
+        "new": new.get("environment", {}).get("revision"),
+        "threshold": args.threshold,
+        "changes": changes,
+        "regressions": regressions,
+    }, indent=2, ensure_ascii=False))
+    if regressions:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the load test and print a JSON report")
+    run_parser.add_argument("--base-url", help="Target an already running app instead of booting one")
+    run_parser.add_argument("--database-url", help="Use this Postgres instead of a temporary cluster")
+    run_parser.add_argument("--pg-max-connections", type=int, default=200)
+    run_parser.add_argument("--workers", type=int, default=1)
+    run_parser.add_argument("--concurrency", type=int, default=32)
+    run_parser.add_argument("--duration", type=float, default=30.0)
+    run_parser.add_argument("--warmup", type=float, default=5.0)
+    run_parser.add_argument("--timeout", type=float, default=30.0)
+    run_parser.add_argument("--mix", default=DEFAULT_MIX)
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--translation-latency-ms", type=float, default=50.0)
+    run_parser.add_argument("--translation-error-rate", type=float, default=0.0)
+    run_parser.add_argument("--output")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="Compare two reports, exit 1 on regression")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative p95/RPS change")
+    compare_parser.add_argument("--error-threshold", type=float, default=0.01, help="Allowed error rate increase")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Бенчмарк: пропускная способность логина и p99 задержки посторонних запросов.
+
+Сравнивает синхронный bcrypt в event loop с PasswordHasher (thread/process).
+Пока идут логины, отдельная корутина имитирует лёгкий эндпоинт и замеряет,
+на сколько event loop задерживает его обработку.
+
+    python -m benchmarks.login_hashing --logins 200 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from app.Infrastructure.password_hasher import PasswordHasher, get_pwd_context
+
+
+PROBE_INTERVAL = 0.005
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe(stop: asyncio.Event, latencies: list):
+    """Имитация постороннего эндпоинта: фиксирует задержку планирования"""
+    while not stop.is_set():
+        scheduled = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        latencies.append((time.perf_counter() - scheduled - PROBE_INTERVAL) * 1000)
+
+
+async def run_mode(mode: str, hashed: str, logins: int, concurrency: int, workers: int) -> dict:
+    hasher = None
+    if mode != "inline":
+        hasher = PasswordHasher(executor_kind=mode, max_workers=workers, queue_limit=logins)
+        # Прогрев пула, чтобы не мерить запуск процессов
+        await asyncio.gather(*(hasher.verify("password", hashed) for _ in range(workers)))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if hasher is None:
+                get_pwd_context().verify("password", hashed)
+                await asyncio.sleep(0)
+            else:
+                await hasher.verify("password", hashed)
+
+    stop = asyncio.Event()
+    latencies: list = []
+    probe_task = asyncio.create_task(probe(stop, latencies))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe_task
+    if hasher is not None:
+        hasher.shutdown()
+
+    return {
+        "mode": mode,
+        "logins": logins,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(logins / elapsed, 1),
+        "probe_samples": len(latencies),
+        "probe_p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "probe_p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--modes", default="inline,thread,process")
+    args = parser.parse_args()
+
+    hashed = get_pwd_context().hash("password")
+    results = []
+    for mode in args.modes.split(","):
+        results.append(await run_mode(mode, hashed, args.logins, args.concurrency, args.workers))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
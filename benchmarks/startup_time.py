@@ -0,0 +1,146 @@
+"""Бенчмарк холодного старта: время импорта app.main и запуска воркера.
+
+import   - `python -X importtime -c "import app.main"` в новом процессе,
+           медиана по --repeat запускам и самые тяжелые пакеты.
+lazy     - модули, которые должны грузиться лениво, не попали в импорт.
+boot     - с --database-url: от запуска uvicorn до первого ответа на /
+           (включает lifespan: проверку схемы и пула).
+
+С --budget-ms завершается с кодом 1, если медиана импорта выше бюджета
+или ленивый модуль загрузился при старте.
+
+    python -m benchmarks.startup_time --repeat 5 --budget-ms 800
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# email_validator сюда не входит: его импортирует сам fastapi.openapi.models
+LAZY_MODULES = ["passlib.context", "httpx", "alembic"]
+
+
+def parse_importtime(stderr: str):
+    """Разбор вывода -X importtime, времена в мкс.
+
+    Возвращает кумулятивное время импортов верхнего уровня и собственное
+    время модулей, сложенное по пакетам (sqlalchemy, pydantic, app, ...):
+    собственные времена не пересекаются, поэтому их можно суммировать.
+    """
+    top_level = {}
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        if not name.startswith("   "):
+            top_level[name.strip()] = int(cumulative)
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(own)
+    return top_level, packages
+
+
+def measure_import(repeat: int, top: int) -> dict:
+    samples = []
+    packages = {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            capture_output=True, text=True, check=True
+        )
+        wall = (time.perf_counter() - started) * 1000
+        top_level, packages = parse_importtime(result.stderr)
+        samples.append({"wall_ms": wall, "import_ms": top_level.get("app.main", 0) / 1000})
+
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "import_ms_median": round(statistics.median(sample["import_ms"] for sample in samples), 1),
+        "import_ms_min": round(min(sample["import_ms"] for sample in samples), 1),
+        "process_ms_median": round(statistics.median(sample["wall_ms"] for sample in samples), 1),
+        "heaviest_packages_ms": {name: round(value / 1000, 1) for name, value in heaviest},
+    }
+
+
+def eagerly_loaded() -> list:
+    code = (
+        "import json, sys, app.main; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_boot(database_url: str, repeat: int, timeout: float) -> dict:
+    samples = []
+    env = dict(os.environ, DATABASE_URL=database_url, TRANSLATION_WORKER_IN_PROCESS="false")
+    for _ in range(repeat):
+        port = free_port()
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env=env
+        )
+        try:
+            while True:
+                if process.poll() is not None:
+                    raise SystemExit(f"App exited with code {process.returncode} during startup")
+                if time.perf_counter() - started > timeout:
+                    raise SystemExit(f"App did not answer in {timeout}s")
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1)
+                    break
+                except (urllib.error.URLError, ConnectionError):
+                    time.sleep(0.01)
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            process.terminate()
+            process.wait()
+    return {
+        "boot_ms_median": round(statistics.median(samples), 1),
+        "boot_ms_max": round(max(samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float)
+    parser.add_argument("--database-url", help="Also measure time to first response under uvicorn")
+    parser.add_argument("--boot-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    report = measure_import(args.repeat, args.top)
+    report["eagerly_loaded_lazy_modules"] = eagerly_loaded()
+    if args.database_url:
+        report.update(measure_boot(args.database_url, args.repeat, args.boot_timeout))
+
+    failures = []
+    if args.budget_ms is not None and report["import_ms_median"] > args.budget_ms:
+        failures.append(f"import of app.main takes {report['import_ms_median']} ms, budget is {args.budget_ms} ms")
+    if report["eagerly_loaded_lazy_modules"]:
+        failures.append(f"loaded at import time: {', '.join(report['eagerly_loaded_lazy_modules'])}")
+    report["failures"] = failures
+
+    print(json.dumps(report, indent=2))
+    if args.budget_ms is not None and failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
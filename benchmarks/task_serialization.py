@@ -0,0 +1,98 @@
+"""Бенчмарк сериализации списка задач: response_model против быстрого пути.
+
+current - как FastAPI обрабатывает response_model=TaskPage для ORM-объектов:
+валидация через Pydantic (from_attributes), dump в json-режиме и
+json.dumps из Starlette JSONResponse.
+fast    - dict-строки из репозитория сразу в FastJSONResponse.
+
+    python -m benchmarks.task_serialization --sizes 1000,10000,100000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from pydantic import TypeAdapter
+from app.api.responses import FastJSONResponse
+from app.domain.schemas.task import TaskPage
+
+
+def make_rows(count: int) -> list:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for index in range(count):
+        rows.append({
+            "id": index + 1,
+            "user_id": 1,
+            "title": f"Встреча с командой {index}",
+            "description": "Обсуждение планов на неделю и распределение задач" if index % 2 else None,
+            "start_time": start + timedelta(hours=index),
+            "end_time": start + timedelta(hours=index, minutes=30),
+            "created_at": datetime(2024, 1, 1, 12, 0, 0),
+            "updated_at": datetime(2024, 1, 2, 12, 0, 0),
+            "translations": [
+                {"language": "en", "title": f"Team meeting {index}", "description": None}
+            ],
+        })
+    return rows
+
+
+def as_objects(rows: list) -> list:
+    """Имитация ORM-объектов с вложенными переводами"""
+    return [
+        SimpleNamespace(**{
+            **row,
+            "translations": [SimpleNamespace(**translation) for translation in row["translations"]],
+        })
+        for row in rows
+    ]
+
+
+def current_path(objects: list) -> bytes:
+    adapter = TypeAdapter(TaskPage)
+    page = adapter.validate_python({"items": objects, "next_cursor": None}, from_attributes=True)
+    content = adapter.dump_python(page, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows: list) -> bytes:
+    return FastJSONResponse({"items": rows, "next_cursor": None}).body
+
+
+def measure(func, payload, count: int, repeat: int) -> dict:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func(payload)
+        best = min(best, time.perf_counter() - started)
+    return {
+        "seconds": round(best, 4),
+        "objects_per_s": round(count / best),
+        "bytes": len(body),
+        "mb_per_s": round(len(body) / best / 1024 / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        rows = make_rows(size)
+        current = measure(current_path, as_objects(rows), size, args.repeat)
+        fast = measure(fast_path, rows, size, args.repeat)
+        results.append({
+            "tasks": size,
+            "current": current,
+            "fast": fast,
+            "speedup": round(current["seconds"] / fast["seconds"], 1),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import prometheus_client
+import pytest
+from pydantic import ValidationError
+from app.Infrastructure.principal_cache import PrincipalCache
+from app.domain.value_objects.principal import Principal
+
+
+def make_principal(user_id=1, is_active=True):
+    return Principal(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com", is_active=is_active)
+
+
+def test_set_after_invalidation_is_dropped():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    generation = cache.generation()
+    # Пока запрос грузил пользователя, другой его деактивировал
+    cache.invalidate_user(1)
+    cache.set("token", make_principal(), generation)
+
+    assert cache.get("token") is None
+
+
+def test_invalidation_of_another_user_keeps_insert():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    generation = cache.generation()
+    cache.invalidate_user(2)
+    cache.set("token", make_principal(), generation)
+
+    assert cache.get("token") == make_principal()
+
+
+def test_evicted_invalidations_still_drop_stale_insert():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    generation = cache.generation()
+    for user_id in (1, 2, 3, 4):
+        cache.invalidate_user(user_id)
+    cache.set("token", make_principal(), generation)
+
+    assert cache.get("token") is None
+    cache.set("token", make_principal(), cache.generation())
+    assert cache.get("token") == make_principal()
+
+
+def test_cached_principal_is_immutable():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.set("token", make_principal(), cache.generation())
+    principal = cache.get("token")
+
+    with pytest.raises(ValidationError):
+        principal.is_active = False
+    assert cache.get("token").is_active
+
+
+def test_hits_and_misses_are_exported():
+    def lookups(result):
+        return prometheus_client.REGISTRY.get_sample_value("principal_cache_lookups_total", {"result": result}) or 0.0
+
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    hits, misses = lookups("hit"), lookups("miss")
+    cache.get("token")
+    cache.set("token", make_principal(), cache.generation())
+    cache.get("token")
+    cache.get("token")
+
+    assert lookups("hit") - hits == 2
+    assert lookups("miss") - misses == 1
@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+from app.Infrastructure.database import READ_ONLY, replica_read
+
+
+class Repository:
+    def __init__(self):
+        self.session = SimpleNamespace(info={})
+        self.seen = []
+
+    @replica_read
+    async def get_one(self):
+        self.seen.append(self.session.info[READ_ONLY])
+
+    @replica_read
+    async def stream(self):
+        for item in range(2):
+            yield item
+        self.seen.append(self.session.info[READ_ONLY])
+
+    @replica_read
+    async def stream_with_nested(self):
+        async for item in self.stream():
+            yield item
+        await self.get_one()
+        self.seen.append(self.session.info[READ_ONLY])
+
+
+def test_nested_stream_keeps_outer_read_only_flag():
+    repository = Repository()
+
+    async def consume():
+        return [item async for item in repository.stream_with_nested()]
+
+    assert asyncio.run(consume()) == [0, 1]
+    assert repository.seen == [True, True, True]
+    assert repository.session.info[READ_ONLY] is False
+
+
+def test_stream_restores_flag_of_enclosing_call():
+    repository = Repository()
+    repository.session.info[READ_ONLY] = True
+
+    async def consume():
+        return [item async for item in repository.stream()]
+
+    assert asyncio.run(consume()) == [0, 1]
+    assert repository.session.info[READ_ONLY] is True
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from app.application.task_services import TaskService
+
+
+class FakeTaskRepository:
+    """Ведет себя как PostgreSQL + asyncpg: timestamptz хранится в UTC,
+    наивное время считается UTC, RETURNING отдает время с поясом"""
+
+    def __init__(self, intervals=None):
+        self.intervals = dict(intervals or {})
+        self.updated = []
+        self.next_id = 100
+
+    async def bulk_delete_tasks(self, user_id, task_ids):
+        return []
+
+    async def get_task_intervals(self, user_id, task_ids):
+        return {task_id: self.intervals[task_id] for task_id in task_ids if task_id in self.intervals}
+
+    async def get_tasks_by_intervals(self, user_id, intervals):
+        return {interval: task_id for task_id, interval in self.intervals.items() if interval in intervals}
+
+    async def bulk_update_tasks(self, rows):
+        # Как executemany: unique_task_interval проверяется на каждой строке
+        for row in rows:
+            start_time, end_time = self.intervals[row["id"]]
+            interval = (row.get("start_time", start_time), row.get("end_time", end_time))
+            if any(other != row["id"] and taken == interval for other, taken in self.intervals.items()):
+                raise RuntimeError("duplicate key value violates unique constraint \"unique_task_interval\"")
+            self.intervals[row["id"]] = interval
+        self.updated.extend(rows)
+
+    async def bulk_create_tasks(self, rows):
+        created = []
+        taken = set(self.intervals.values())
+        # RETURNING не гарантирует порядок строк
+        for row in reversed(rows):
+            interval = tuple(
+                (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).astimezone(timezone.utc)
+                for value in (row["start_time"], row["end_time"])
+            )
+            if interval in taken:
+                continue
+            taken.add(interval)
+            self.next_id += 1
+            self.intervals[self.next_id] = interval
+            created.append({"id": self.next_id, "start_time": interval[0], "end_time": interval[1]})
+        return created
+
+
+class FakeJobRepository:
+    def __init__(self):
+        self.enqueued = []
+
+    async def enqueue_many(self, task_ids, commit=True):
+        self.enqueued.extend(task_ids)
+
+
+def apply_batch(task_repo, create=(), update=(), delete=()):
+    job_repo = FakeJobRepository()
+    service = TaskService(task_repo, job_repo)
+    results = asyncio.run(service.apply_batch(1, list(create), list(update), list(delete)))
+    return results, job_repo.enqueued
+
+
+def test_batch_create_matches_naive_and_offset_datetimes():
+    task_repo = FakeTaskRepository()
+    results, enqueued = apply_batch(task_repo, create=[
+        {"title": "naive", "start_time": "2026-01-01T10:00:00", "end_time": "2026-01-01T11:00:00"},
+        {"title": "offset", "start_time": "2026-01-01T15:00:00+03:00", "end_time": "2026-01-01T16:00:00+03:00"},
+        {"title": "utc", "start_time": "2026-01-01T14:00:00Z", "end_time": "2026-01-01T15:00:00Z"},
+    ])
+
+    assert [result.ok for result in results] == [True, True, True]
+    assert all(result.id is not None for result in results)
+    assert sorted(enqueued) == sorted(result.id for result in results)
+
+
+def test_batch_create_reports_interval_taken_by_same_time_in_another_offset():
+    task_repo = FakeTaskRepository()
+    results, enqueued = apply_batch(task_repo, create=[
+        {"title": "naive", "start_time": "2026-01-01T10:00:00", "end_time": "2026-01-01T11:00:00"},
+        {"title": "same", "start_time": "2026-01-01T13:00:00+03:00", "end_time": "2026-01-01T14:00:00+03:00"},
+    ])
+
+    assert [result.ok for result in results] == [True, False]
+    assert results[1].error == "Task with the same time interval already exists"
+    assert enqueued == [results[0].id]
+
+
+def test_batch_update_accepts_naive_datetime_for_stored_interval():
+    start = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+    task_repo = FakeTaskRepository({7: (start, start + timedelta(hours=1))})
+    results, _ = apply_batch(task_repo, update=[
+        {"id": 7, "end_time": "2026-01-01T12:00:00"},
+        {"id": 7, "end_time": "2026-01-01T09:00:00"},
+    ])
+
+    assert [result.ok for result in results] == [True, False]
+    assert task_repo.updated == [{"id": 7, "end_time": datetime(2026, 1, 1, 12, tzinfo=timezone.utc)}]
+
+
+def test_batch_update_onto_taken_interval_is_item_error():
+    start = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+    hour = timedelta(hours=1)
+    task_repo = FakeTaskRepository({
+        7: (start, start + hour),
+        8: (start + 2 * hour, start + 3 * hour),
+        9: (start + 4 * hour, start + 5 * hour),
+    })
+    results, _ = apply_batch(task_repo, update=[
+        # На интервал задачи 8, которой нет в пакете
+        {"id": 7, "start_time": "2026-01-01T12:00:00", "end_time": "2026-01-01T13:00:00"},
+        # Задача 9 уходит со своего интервала, и 7 его занимает
+        {"id": 9, "start_time": "2026-01-01T18:00:00Z", "end_time": "2026-01-01T19:00:00Z"},
+        {"id": 7, "start_time": "2026-01-01T17:00:00+03:00", "end_time": "2026-01-01T18:00:00+03:00"},
+        # Тот же интервал внутри пакета уже занят задачей 9
+        {"id": 8, "start_time": "2026-01-01T18:00:00", "end_time": "2026-01-01T19:00:00"},
+    ])
+
+    assert [result.ok for result in results] == [False, True, True, False]
+    assert results[0].error == "Task with the same time interval already exists"
+    assert results[3].error == "Task with the same time interval already exists"
+    assert task_repo.intervals[7] == (start + 4 * hour, start + 5 * hour)
+    assert task_repo.intervals[8] == (start + 2 * hour, start + 3 * hour)
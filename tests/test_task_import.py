@@ -0,0 +1,45 @@
+import asyncio
+from app.application.import_services import iter_csv_rows, iter_lines, iter_ndjson_rows
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def parse(parser, *chunks):
+    async def collect():
+        return [row async for row in parser(iter_lines(stream(*chunks)))]
+    return asyncio.run(collect())
+
+
+def test_ndjson_invalid_utf8_line_is_row_error():
+    rows = parse(
+        iter_ndjson_rows,
+        b'{"title": "\xd0\x9f\xd0\xb5\xd1\x80\xd0\xb2\xd0\xb0\xd1\x8f"}\n{"title": "\xff\xfe"}\n',
+        b'{"title": "third"}'
+    )
+
+    assert rows == [{"title": "Первая"}, None, {"title": "third"}]
+
+
+def test_line_split_between_chunks_inside_multibyte_char():
+    encoded = '{"title": "Задача"}\n'.encode()
+    rows = parse(iter_ndjson_rows, encoded[:12], encoded[12:])
+
+    assert rows == [{"title": "Задача"}]
+
+
+def test_csv_invalid_utf8_line_is_row_error():
+    rows = parse(
+        iter_csv_rows,
+        b"title,description\r\n",
+        b"first,ok\r\n\xc3\x28,broken\r\n",
+        b'"multi\nline",ok\r\n'
+    )
+
+    assert rows == [
+        {"title": "first", "description": "ok"},
+        None,
+        {"title": "multi\nline", "description": "ok"},
+    ]
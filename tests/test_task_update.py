@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from app.application.task_services import TaskService
+
+START = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+END = datetime(2026, 1, 1, 11, tzinfo=timezone.utc)
+
+
+class FakeJobRepository:
+    async def enqueue(self, task_id, commit=True):
+        pass
+
+
+class FakeTaskRepository:
+    def __init__(self, conflicts=()):
+        self.task = SimpleNamespace(id=7, user_id=1, start_time=START, end_time=END)
+        self.conflicts = list(conflicts)
+        self.checked = None
+
+    async def get_task_by_id(self, task_id):
+        return self.task
+
+    async def find_conflicts(self, user_id, start_time, end_time, exclude_task_id=None):
+        self.checked = (start_time, end_time)
+        return self.conflicts
+
+    async def update_task(self, task_id, commit=True, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self.task, key, value)
+        return self.task
+
+
+def update_task(task_repo, **kwargs):
+    service = TaskService(task_repo, FakeJobRepository())
+    return asyncio.run(service.update_task(7, **kwargs))
+
+
+def test_naive_start_time_is_checked_against_stored_interval():
+    task_repo = FakeTaskRepository()
+    task = update_task(task_repo, check_conflicts=True, start_time=datetime(2026, 1, 1, 9, 30))
+
+    assert task.start_time == datetime(2026, 1, 1, 9, 30, tzinfo=timezone.utc)
+    assert task_repo.checked == (task.start_time, END)
+
+
+def test_inverted_interval_is_rejected_without_conflict_check():
+    task_repo = FakeTaskRepository()
+    with pytest.raises(ValueError):
+        update_task(task_repo, end_time=datetime(2026, 1, 1, 9))
+
+    assert task_repo.task.end_time == END
+
+
+def test_conflicting_interval_is_409():
+    task_repo = FakeTaskRepository(conflicts=[8])
+    with pytest.raises(HTTPException) as error:
+        update_task(task_repo, check_conflicts=True, end_time=datetime.fromisoformat("2026-01-01T15:00:00+03:00"))
+
+    assert error.value.status_code == 409
@@ -0,0 +1,73 @@
+import asyncio
+import httpx
+import prometheus_client
+from fastapi import HTTPException
+from app.Infrastructure.translation_batcher import TranslationBatcher
+
+
+def provider_error(status_code):
+    """Ошибка в том виде, в каком ее отдает TranslationClient"""
+    request = httpx.Request("POST", "https://translate.example/v2")
+    response = httpx.Response(status_code, request=request)
+    try:
+        try:
+            response.raise_for_status()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Translation service error: {e}") from e
+    except HTTPException as e:
+        return e
+
+
+class FailingBatchClient:
+    def __init__(self, error):
+        self.error = error
+        self.single_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def translate_batch(self, texts, target_lang="en", source_lang="ru"):
+        raise self.error
+
+    async def translate_text(self, text, target_lang="en", source_lang="ru"):
+        self.single_calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return f"[{target_lang}] {text}"
+
+
+def failures(action):
+    return prometheus_client.REGISTRY.get_sample_value("translation_batch_failures_total", {"action": action}) or 0.0
+
+
+async def translate_all(batcher, texts):
+    return await asyncio.gather(*(batcher.translate_text(text, "en", "ru") for text in texts), return_exceptions=True)
+
+
+def test_overloaded_provider_fails_all_waiters_without_fan_out():
+    error = provider_error(503)
+    client = FailingBatchClient(error)
+    batcher = TranslationBatcher(client, window_seconds=0.01, max_items=100, max_chars=10000)
+    failed_before = failures("failed")
+
+    results = asyncio.run(translate_all(batcher, [f"Задача {i}" for i in range(10)]))
+
+    assert all(result is error for result in results)
+    assert client.single_calls == 0
+    assert failures("failed") - failed_before == 1
+
+
+def test_rejected_batch_is_split_with_capped_concurrency():
+    client = FailingBatchClient(provider_error(400))
+    batcher = TranslationBatcher(client, window_seconds=0.01, max_items=100, max_chars=10000, fallback_concurrency=3)
+    batches_before = prometheus_client.REGISTRY.get_sample_value("translation_batches_total") or 0.0
+    split_before = failures("split")
+
+    results = asyncio.run(translate_all(batcher, [f"Задача {i}" for i in range(10)]))
+
+    assert results == [f"[en] Задача {i}" for i in range(10)]
+    assert client.single_calls == 10
+    assert client.max_in_flight == 3
+    assert failures("split") - split_before == 1
+    assert prometheus_client.REGISTRY.get_sample_value("translation_batches_total") - batches_before == 1
@@ -0,0 +1,28 @@
+import asyncio
+import prometheus_client
+from app.Infrastructure.translation_cache import TranslationCache
+
+
+class EchoTranslator:
+    async def translate_many(self, texts, target_lang="en", source_lang="ru"):
+        return [f"[{target_lang}] {text}" for text in texts]
+
+
+def sample(name, tier):
+    return prometheus_client.REGISTRY.get_sample_value(name, {"tier": tier}) or 0.0
+
+
+def test_memory_tier_hits_misses_and_bytes_saved_are_exported():
+    cache = TranslationCache(max_size=10, persistent=False)
+    before = {
+        name: sample(name, "memory")
+        for name in ("translation_cache_hits_total", "translation_cache_misses_total", "translation_cache_bytes_saved_total")
+    }
+
+    asyncio.run(cache.get_or_translate(["Задача", "Описание"], EchoTranslator()))
+    asyncio.run(cache.get_or_translate(["Задача", "Новое"], EchoTranslator()))
+
+    assert sample("translation_cache_hits_total", "memory") - before["translation_cache_hits_total"] == 1
+    assert sample("translation_cache_misses_total", "memory") - before["translation_cache_misses_total"] == 3
+    assert sample("translation_cache_bytes_saved_total", "memory") - before["translation_cache_bytes_saved_total"] == len("Задача".encode())
+    assert cache.stats()["memory_hits"] == 1
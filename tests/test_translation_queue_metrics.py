@@ -0,0 +1,21 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.application.translation_worker import TranslationWorkerPool
+from app.main import app
+
+
+class StubbedStatsPool(TranslationWorkerPool):
+    async def get_stats(self) -> dict:
+        return {"pending": 12, "running": 3, "dead": 1, "lag_seconds": 42.5}
+
+
+def test_queue_stats_are_exported_on_metrics():
+    asyncio.run(StubbedStatsPool().refresh_metrics())
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert 'translation_queue_jobs{status="pending"} 12.0' in response.text
+    assert 'translation_queue_jobs{status="running"} 3.0' in response.text
+    assert 'translation_queue_jobs{status="dead"} 1.0' in response.text
+    assert "translation_queue_lag_seconds 42.5" in response.text